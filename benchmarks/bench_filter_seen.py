@@ -0,0 +1,89 @@
+"""
+Benchmark the vectorized seen filter (src.seen_store.seen_mask) against the original iterrows implementation.
+
+Usage (from the project folder):
+    python -m benchmarks.bench_filter_seen
+    python -m benchmarks.bench_filter_seen --sizes 10000 100000 --scraped 2000
+"""
+import argparse
+import time
+import pandas as pd
+from benchmarks.synthetic import make_jobs, make_scraped
+from main import get_job_identity
+from src.seen_store import seen_mask
+
+
+def legacy_filter_seen(scraped_jobs, seen_jobs):
+    """
+    The row-by-row filter_seen this benchmark compares against.
+    """
+    seen_job_urls = set(seen_jobs["job_url"].dropna().tolist())
+
+    seen_identity = set(
+        (
+            row["title"].strip().lower(),
+            row["company"].strip().lower(),
+            row["location"].strip().lower(),
+        )
+        for _, row in seen_jobs.dropna(subset=["title", "company", "location"]).iterrows()
+    )
+
+    filtered_jobs = []
+    for _, job in scraped_jobs.iterrows():
+        job_url = str(job.get("job_url", "")).strip()
+        identity = get_job_identity(job)
+
+        if job_url in seen_job_urls or identity in seen_identity:
+            continue
+        filtered_jobs.append(job)
+
+    filtered_jobs_df = pd.DataFrame(filtered_jobs)
+    updated_seen_jobs = pd.concat([seen_jobs, filtered_jobs_df], ignore_index=True)
+    updated_seen_jobs = updated_seen_jobs.drop_duplicates(subset="job_url")
+
+    return filtered_jobs_df, updated_seen_jobs
+
+
+def vectorized_filter_seen(scraped_jobs, seen_jobs):
+    """
+    The same contract as legacy_filter_seen, built on seen_mask.
+    """
+    filtered_jobs_df = scraped_jobs[~seen_mask(scraped_jobs, seen_jobs).to_numpy()]
+    updated_seen_jobs = pd.concat([seen_jobs, filtered_jobs_df], ignore_index=True)
+    updated_seen_jobs = updated_seen_jobs.drop_duplicates(subset="job_url")
+
+    return filtered_jobs_df, updated_seen_jobs
+
+
+def time_call(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--scraped", type=int, default=1_000, help="Number of scraped jobs per run.")
+    parser.add_argument("--skip-legacy-above", type=int, default=None,
+                        help="Skip the (slow) legacy implementation above this many seen rows.")
+    args = parser.parse_args()
+
+    print(f"{'seen rows':>10} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+    for size in args.sizes:
+        seen_jobs = make_jobs(size, seed=size, with_description=False)
+        scraped_jobs = make_scraped(seen_jobs, args.scraped, seed=size)
+
+        new_time, (new_filtered, _) = time_call(vectorized_filter_seen, scraped_jobs, seen_jobs)
+
+        if args.skip_legacy_above is not None and size > args.skip_legacy_above:
+            print(f"{size:>10} {'skipped':>12} {new_time:>15.3f} {'-':>9}")
+            continue
+
+        old_time, (old_filtered, _) = time_call(legacy_filter_seen, scraped_jobs, seen_jobs)
+        assert old_filtered["job_url"].tolist() == new_filtered["job_url"].tolist(), "results differ"
+        print(f"{size:>10} {old_time:>12.3f} {new_time:>15.3f} {old_time / new_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Startup benchmark of the CLI commands: the import time (from python -X importtime) and wall time of
+a fresh interpreter that loads what each command needs, against loading everything like main.py used to.
+
+Usage (from the project folder):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 10 --top 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.synthetic import make_jobs
+from src.utils import save_jobs
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (case, python code run in a fresh interpreter): each command's imports, up to where it starts working.
+CASES = [
+    ("everything (old main.py)", "import main, gui, src.scraper, src.llm_filter"),
+    ("scrape", "import cli, main, src.scraper"),
+    ("filter", "import cli, main"),
+    ("view", "import cli, gui"),
+    ("stats", "import cli; cli.stats(None)"),
+]
+
+
+def import_times(stderr):
+    """
+    Return the total import time in seconds and the (module, seconds) pairs of the top-level imports,
+    parsed from the -X importtime report.
+    """
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented by two spaces per level.
+        if not name[1:].startswith(" "):
+            top_level.append((name.strip(), int(cumulative) / 1e6))
+    return sum(seconds for _, seconds in top_level), top_level
+
+
+def run_case(code, directory, repeat):
+    """
+    Return the best wall time, and the import times of the fastest run, of code in a fresh interpreter.
+    """
+    env = {**os.environ, "PYTHONPATH": PROJECT_DIR}
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=directory, env=env, capture_output=True, text=True
+        )
+        seconds = time.perf_counter() - start
+        if result.returncode != 0:
+            raise Exception(f"{code!r} failed:\n{result.stderr[-2000:]}")
+        if best is None or seconds < best[0]:
+            best = (seconds, *import_times(result.stderr))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the fastest is reported.")
+    parser.add_argument("--top", type=int, default=3, help="Heaviest top-level imports to list per case.")
+    parser.add_argument("--jobs", type=int, default=10_000, help="Jobs in the new jobs file that stats counts.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "config.json"), "w") as f:
+            json.dump({"seen_file": "seen.db"}, f)
+        save_jobs(os.path.join(directory, "new_jobs.csv"), make_jobs(args.jobs, description_words=50))
+
+        print(f"{'case':<28} {'wall':>9} {'imports':>9}  heaviest imports")
+        for case, code in CASES:
+            wall, imports, top_level = run_case(code, directory, args.repeat)
+            heaviest = sorted(top_level, key=lambda item: -item[1])[:args.top]
+            details = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in heaviest)
+            print(f"{case:<28} {wall:>8.3f}s {imports:>8.3f}s  {details}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+A stand-in for jobspy.scrape_jobs that serves synthetic jobs with configurable latency and error injection.
+"""
+import contextlib
+import random
+import threading
+import time
+import zlib
+import pandas as pd
+import src.descriptions
+import src.scraper
+from benchmarks.synthetic import make_jobs
+
+
+class FakeJobBoard:
+    """
+    Callable with the scrape_jobs signature. Each call sleeps for latency seconds (per site, or a default),
+    fails with probability error_rate (or with a 429 error, with probability throttle_rate), and otherwise returns
+    results_wanted jobs per requested site, the same ones for the same (site, search term, offset) every time. Like jobspy, LinkedIn jobs only come
+    with descriptions when linkedin_fetch_description is set, which costs one extra request per job;
+    fetch_description stands in for fetching one afterwards.
+    With silent_throttling, a throttled call returns an empty DataFrame instead of raising, as jobspy does.
+    """
+
+    def __init__(self, latency=0.1, error_rate=0.0, throttle_rate=0.0, description_words=300, seed=0,
+                 silent_throttling=False):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.silent_throttling = silent_throttling
+        self.description_words = description_words
+        self.seed = seed
+        self.calls = 0
+        self.description_requests = 0
+        self._descriptions = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+    def _latency(self, site):
+        if isinstance(self.latency, dict):
+            return self.latency.get(site, 0.0)
+        return self.latency
+
+    def __call__(self, site_name=None, search_term=None, google_search_term=None, results_wanted=15,
+                 offset=0, linkedin_fetch_description=False, **kwargs):
+        sites = site_name if isinstance(site_name, list) else [site_name]
+        term = search_term or google_search_term or ""
+        with self._lock:
+            self.calls += 1
+            fail = self._random.random() < self.error_rate
+            throttle = self._random.random() < self.throttle_rate
+
+        time.sleep(max(self._latency(site) for site in sites))
+        if fail:
+            raise ConnectionError(f"Injected error for {sites} '{term}'.")
+        if throttle and self.silent_throttling:
+            return pd.DataFrame()
+        if throttle:
+            raise ConnectionError(f"429 Too Many Requests for {sites} '{term}'.")
+
+        frames = []
+        for site in sites:
+            seed = zlib.crc32(f"{self.seed}|{site}|{term}".encode("utf-8")) % 100_000
+            jobs = make_jobs(results_wanted, seed=seed + offset, start=seed * 1000 + offset,
+                             sites=[site], description_words=self.description_words)
+            if site == "linkedin":
+                if linkedin_fetch_description:
+                    with self._lock:
+                        self.description_requests += len(jobs)
+                    time.sleep(self._latency(site) * 0.1 * len(jobs))
+                else:
+                    with self._lock:
+                        self._descriptions.update(zip(jobs["job_url"], jobs["description"]))
+                    jobs["description"] = None
+            frames.append(jobs)
+        return pd.concat(frames, ignore_index=True)
+
+    def fetch_description(self, session, job_url, proxies=None, timeout=15):
+        """
+        Stand-in for src.descriptions.fetch_linkedin_description.
+        """
+        with self._lock:
+            self.description_requests += 1
+        time.sleep(self._latency("linkedin") * 0.1)
+        with self._lock:
+            return self._descriptions.get(job_url)
+
+
+@contextlib.contextmanager
+def installed(board):
+    """
+    Make JobScraper call board instead of jobspy.scrape_jobs, and DescriptionFetcher fetch LinkedIn
+    descriptions from it, while the context is active.
+    """
+    original = src.scraper.scrape_jobs
+    original_fetcher = src.descriptions.FETCHERS["linkedin"]
+    src.scraper.scrape_jobs = board
+    src.descriptions.FETCHERS["linkedin"] = board.fetch_description
+    try:
+        yield board
+    finally:
+        src.scraper.scrape_jobs = original
+        src.descriptions.FETCHERS["linkedin"] = original_fetcher
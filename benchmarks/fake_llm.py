@@ -0,0 +1,107 @@
+"""
+A local OpenAI-compatible chat completions server for benchmarking the LLM filter without OpenAI.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeLLMServer:
+    """
+    Serves POST /v1/chat/completions for the structured outputs sent by src.llm_filter.AsyncLLMFilter
+    (single and batched). A job is kept unless its text mentions
+    reject_word. Each request sleeps for latency seconds, and every rate_limit_every-th request is
+    answered with a 429 and a Retry-After header.
+
+        with FakeLLMServer(latency=0.2) as server:
+            AsyncLLMFilter("key", prompt, base_url=server.base_url).filter(jobs)
+    """
+
+    def __init__(self, latency=0.05, rate_limit_every=0, retry_after=0.1, reject_word="otters"):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.reject_word = reject_word
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _respond(self, body):
+        user = body["messages"][-1]["content"]
+        schema = json.dumps(body.get("response_format", {}))
+        if '"decisions"' in schema:
+            jobs = re.split(r"^job_id: (\d+)$", user, flags=re.MULTILINE)[1:]
+            content = {"decisions": [
+                {"job_id": int(job_id), "keep_job": self.reject_word not in text.lower()}
+                for job_id, text in zip(jobs[::2], jobs[1::2])
+            ]}
+        else:
+            content = {"keep_job": self.reject_word not in user.lower()}
+
+        prompt_tokens = sum(len(m["content"]) for m in body["messages"]) // 4
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": json.dumps(content)},
+            }],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 8, "total_tokens": prompt_tokens + 8},
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server._lock:
+                    server.requests += 1
+                    count = server.requests
+                if server.rate_limit_every and count % server.rate_limit_every == 0:
+                    self._send(429, {"error": {"message": "Rate limited (fake)."}},
+                               {"retry-after": str(server.retry_after)})
+                    return
+                time.sleep(server.latency)
+                self._send(200, server._respond(body))
+
+        return Handler
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
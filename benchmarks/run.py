@@ -0,0 +1,295 @@
+"""
+Benchmark suite: run-level dedup, seen filtering, CSV persistence, storage footprint and end-to-end main() at several
+data scales, against synthetic jobs, a fake job board and a fake LLM server. Nothing hits the network.
+
+Usage (from the project folder):
+    python -m benchmarks.run
+    python -m benchmarks.run --suite seen persistence --scale 10000 100000
+    python -m benchmarks.run --suite e2e --scale 5 20 40 --board-latency 0.2 --llm-latency 0.3
+    python -m benchmarks.run --suite e2e --scale 20 --rank --llm-max-jobs 100
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import tempfile
+import time
+import pandas as pd
+from benchmarks.fake_board import FakeJobBoard, installed
+from benchmarks.fake_llm import FakeLLMServer
+from benchmarks.synthetic import make_jobs, make_scraped
+from src.pipeline import RunDeduplicator
+from src.schema import compact_jobs_frame
+from src.seen_store import CsvSeenStore, ParquetSeenStore, SqliteSeenStore, seen_mask
+from src.parquet_store import read_parquet_jobs
+from src.utils import load_jobs, load_seen_jobs, save_jobs
+
+DEFAULT_SCALES = {
+    "dedup": [1_000, 10_000, 100_000],
+    "seen": [10_000, 100_000, 1_000_000],
+    "persistence": [1_000, 10_000, 100_000],
+    "storage": [10_000, 100_000],
+    "schema": [10_000, 100_000],
+    "e2e": [5, 20, 40],
+}
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+@contextlib.contextmanager
+def quiet():
+    """
+    Silence the pipeline's progress prints while timing.
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def timed(fn, *args, repeat=3, **kwargs):
+    """
+    Return the best wall time of repeat calls of fn.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(suite, case, scale, seconds, **extra):
+    details = " ".join(f"{k}={v}" for k, v in extra.items())
+    print(f"{suite:<12} {case:<28} {scale:>10} {seconds:>10.4f}s {details}")
+
+
+def bench_dedup(scale):
+    """
+    Drop within-run duplicates from scale scraped jobs arriving in batches of 60:
+    the old concat-then-drop_duplicates against the streaming RunDeduplicator.
+    """
+    jobs = make_jobs(scale, seed=scale, with_description=False)
+    jobs = pd.concat([jobs, jobs.sample(frac=0.3, random_state=1)], ignore_index=True)
+    batches = [jobs.iloc[i:i + 60] for i in range(0, len(jobs), 60)]
+
+    def legacy():
+        new_jobs = pd.DataFrame()
+        for batch in batches:
+            new_jobs = pd.concat([new_jobs, batch], ignore_index=True)
+        new_jobs = new_jobs.drop_duplicates(subset="job_url")
+        return new_jobs.drop_duplicates(subset=["title", "company", "location"])
+
+    def streaming():
+        deduplicate = RunDeduplicator()
+        return sum(len(deduplicate(batch)) for batch in batches)
+
+    report("dedup", "concat + drop_duplicates", scale, timed(legacy, repeat=1))
+    report("dedup", "RunDeduplicator", scale, timed(streaming, repeat=1))
+
+
+def bench_seen(scale):
+    """
+    Check 1000 scraped jobs against a seen history of scale rows, in memory and in SQLite,
+    and check and add a 60-job batch with the CSV and Parquet stores.
+    """
+    seen_jobs = make_jobs(scale, seed=scale, with_description=False)
+    scraped = make_scraped(seen_jobs, 1_000, seed=scale)
+    report("seen", "seen_mask", scale, timed(seen_mask, scraped, seen_jobs))
+
+    with tempfile.TemporaryDirectory() as directory, quiet():
+        store = SqliteSeenStore(os.path.join(directory, "seen.db"))
+        for start in range(0, scale, 100_000):
+            store.add(seen_jobs.iloc[start:start + 100_000])
+        store.commit()
+        seconds = timed(store.is_seen, scraped)
+        store.close()
+    report("seen", "SqliteSeenStore.is_seen", scale, seconds)
+
+    for store_class, name in ((CsvSeenStore, "seen.csv"), (ParquetSeenStore, "seen.parquet")):
+        with tempfile.TemporaryDirectory() as directory, quiet():
+            store = store_class(os.path.join(directory, name))
+            store.add(seen_jobs)
+            store.commit()
+            batch = scraped.iloc[:60]
+
+            def check_and_add():
+                store.add(batch[~store.is_seen(batch).to_numpy()])
+                store.rollback()
+
+            seconds = timed(check_and_add)
+        report("seen", f"{store_class.__name__} batch of 60", scale, seconds)
+
+
+def bench_persistence(scale):
+    """
+    Add 50 jobs to a new_jobs.csv that already holds scale jobs:
+    the old read-concat-rewrite against save_jobs' append.
+    """
+    existing = make_jobs(scale, seed=scale)
+    new = make_jobs(50, seed=scale + 1, start=10 ** 9)
+
+    with tempfile.TemporaryDirectory() as directory, quiet():
+        path = os.path.join(directory, "new_jobs.csv")
+
+        def legacy():
+            jobs = pd.concat([pd.read_csv(path), new], ignore_index=True)
+            jobs.to_csv(path, quoting=csv.QUOTE_NONNUMERIC, escapechar="\\", index=False)
+
+        existing.to_csv(path, quoting=csv.QUOTE_NONNUMERIC, escapechar="\\", index=False)
+        legacy_seconds = timed(legacy, repeat=1)
+        existing.to_csv(path, quoting=csv.QUOTE_NONNUMERIC, escapechar="\\", index=False)
+        append_seconds = timed(save_jobs, path, new, append=True, repeat=1)
+        size = os.path.getsize(path)
+
+    report("persistence", "read + rewrite", scale, legacy_seconds, file_mb=round(size / 1e6, 1))
+    report("persistence", "save_jobs(append=True)", scale, append_seconds, file_mb=round(size / 1e6, 1))
+
+
+def bench_storage(scale):
+    """
+    Load a seen history of scale jobs (with descriptions) from CSV and from Parquet, where only
+    the seen columns are read. Needs pyarrow.
+    """
+    jobs = make_jobs(scale, seed=scale)
+
+    with tempfile.TemporaryDirectory() as directory, quiet():
+        csv_path = os.path.join(directory, "seen.csv")
+        parquet_path = os.path.join(directory, "seen.parquet")
+        save_jobs(csv_path, jobs)
+        for start in range(0, scale, 10_000):
+            save_jobs(parquet_path, jobs.iloc[start:start + 10_000], append=True)
+        csv_mb = round(os.path.getsize(csv_path) / 1e6, 1)
+        parquet_mb = round(sum(entry.stat().st_size for entry in os.scandir(parquet_path)) / 1e6, 1)
+        csv_seconds = timed(load_seen_jobs, csv_path, repeat=1)
+        parquet_seconds = timed(load_seen_jobs, parquet_path, repeat=1)
+
+    report("storage", "load seen (CSV)", scale, csv_seconds, file_mb=csv_mb)
+    report("storage", "load seen (Parquet)", scale, parquet_seconds, file_mb=parquet_mb)
+
+
+def _size_mb(path):
+    if os.path.isdir(path):
+        return round(sum(entry.stat().st_size for entry in os.scandir(path)) / 1e6, 2)
+    return round(os.path.getsize(path) / 1e6, 2)
+
+
+def bench_schema(scale):
+    """
+    Memory of scale scraped jobs with every jobspy column against the compact schema, and the load time
+    and footprint of their seen history stored as strings against hashed identities. Needs pyarrow.
+    """
+    jobs = make_jobs(scale, seed=scale)
+    compact = compact_jobs_frame(jobs)
+    report("schema", "all jobspy columns", scale, timed(lambda: jobs.memory_usage(deep=True).sum(), repeat=1),
+           memory_mb=round(jobs.memory_usage(deep=True).sum() / 1e6, 1))
+    report("schema", "compact_jobs_frame", scale, timed(compact_jobs_frame, jobs, repeat=1),
+           memory_mb=round(compact.memory_usage(deep=True).sum() / 1e6, 1))
+
+    with tempfile.TemporaryDirectory() as directory, quiet():
+        strings_path = os.path.join(directory, "strings.parquet")
+        save_jobs(strings_path, jobs[["title", "company", "location", "job_url"]])
+        strings_seconds = timed(load_seen_jobs, strings_path, repeat=1)
+        strings = load_seen_jobs(strings_path)
+        hashed_path = os.path.join(directory, "seen.parquet")
+        store = ParquetSeenStore(hashed_path)
+        store.add(jobs)
+        store.commit()
+        store.close()
+        hashed_seconds = timed(ParquetSeenStore, hashed_path, repeat=1)
+        hashed = read_parquet_jobs(hashed_path, columns=["job_url", "identity"])
+        sizes = {path: _size_mb(path) for path in (strings_path, hashed_path)}
+
+    report("schema", "seen as strings (Parquet)", scale, strings_seconds, file_mb=sizes[strings_path],
+           memory_mb=round(strings.memory_usage(deep=True).sum() / 1e6, 1))
+    report("schema", "ParquetSeenStore (hashed)", scale, hashed_seconds, file_mb=sizes[hashed_path],
+           memory_mb=round(hashed.memory_usage(deep=True).sum() / 1e6, 1))
+
+
+def bench_e2e(scale, board_latency=0.05, llm_latency=0.05, error_rate=0.0, max_workers=4, defer_descriptions=False,
+              rank=False, llm_max_jobs=None, seen_file="seen.db"):
+    """
+    Run main() end to end with scale board search terms (20 results per site each),
+    against the fake job board and the fake LLM server. With rank, jobs are ranked against a profile
+    that favours Python backend roles; llm_max_jobs caps the jobs sent to the LLM. seen_file picks the
+    seen store (seen.csv for the CSV store).
+    """
+    import main
+
+    config = {
+        "search_job_boards": True,
+        "board_search_terms": [{"search_term": f"role {i}", "location": "San Francisco"} for i in range(scale)],
+        "search_google_jobs": False,
+        "filter_with_llm": True,
+        "llm_api_key": "fake",
+        "llm_prompt": "No otters.",
+        "max_workers": max_workers,
+        "seen_file": seen_file,
+        "defer_descriptions": defer_descriptions,
+        "filter_job_titles": True,
+        "job_titles_to_filter": ["Line Cook", "Burger Flipper"],
+        "rank_jobs": rank,
+        "ranking_profile": {"keywords": {"python": 2, "backend": 2, "apis": 1}, "preferred_locations": ["remote"]},
+        "llm_max_jobs_per_run": llm_max_jobs,
+    }
+    board = FakeJobBoard(latency=board_latency, error_rate=error_rate)
+
+    with tempfile.TemporaryDirectory() as directory, working_directory(directory):
+        with FakeLLMServer(latency=llm_latency) as server, installed(board):
+            config["llm_base_url"] = server.base_url
+            with open("config.json", "w") as f:
+                json.dump(config, f)
+            with quiet():
+                start = time.perf_counter()
+                main.main()
+                seconds = time.perf_counter() - start
+            kept = len(load_jobs("new_jobs.csv", columns=["job_url"])) if os.path.exists("new_jobs.csv") else 0
+            case = "main()" + (", deferred descriptions" if defer_descriptions else "") + (", ranked" if rank else "")
+            report("e2e", case, scale, seconds, board_calls=board.calls,
+                   description_requests=board.description_requests, llm_requests=server.requests, kept=kept)
+
+
+SUITES = {
+    "dedup": bench_dedup,
+    "seen": bench_seen,
+    "persistence": bench_persistence,
+    "storage": bench_storage,
+    "schema": bench_schema,
+    "e2e": bench_e2e,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suite", nargs="+", choices=list(SUITES), default=list(SUITES))
+    parser.add_argument("--scale", type=int, nargs="+", help="Override the default scales of the chosen suites.")
+    parser.add_argument("--board-latency", type=float, default=0.05, help="Fake job board latency per call (s).")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake LLM latency per request (s).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake job board error probability.")
+    parser.add_argument("--defer-descriptions", action="store_true",
+                        help="Run the e2e suite with deferred description fetching.")
+    parser.add_argument("--rank", action="store_true", help="Run the e2e suite with relevance ranking.")
+    parser.add_argument("--seen-file", default="seen.db", help="Seen history of the e2e suite (.db, .parquet or .csv).")
+    parser.add_argument("--llm-max-jobs", type=int, help="Cap the jobs the e2e suite sends to the LLM per run.")
+    args = parser.parse_args()
+
+    print(f"{'suite':<12} {'case':<28} {'scale':>10} {'time':>11}")
+    for suite in args.suite:
+        for scale in args.scale or DEFAULT_SCALES[suite]:
+            if suite == "e2e":
+                bench_e2e(scale, board_latency=args.board_latency, llm_latency=args.llm_latency,
+                          error_rate=args.error_rate, defer_descriptions=args.defer_descriptions,
+                          rank=args.rank, llm_max_jobs=args.llm_max_jobs, seen_file=args.seen_file)
+            else:
+                SUITES[suite](scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Synthetic job data shaped like the output of jobspy.scrape_jobs.
+"""
+import numpy as np
+import pandas as pd
+from src.schema import JOBSPY_COLUMNS
+
+SITES = ["linkedin", "zip_recruiter", "glassdoor", "indeed", "google"]
+TITLES = [
+    "Software Engineer", "Software Engineer Intern", "Backend Developer", "Data Scientist",
+    "Machine Learning Engineer", "Frontend Engineer", "DevOps Engineer", "Line Cook", "Burger Flipper",
+]
+CITIES = ["San Francisco, CA", "Palo Alto, CA", "New York, NY", "Austin, TX", "Seattle, WA", "Remote"]
+WORDS = (
+    "we are looking for a motivated engineer to join our team you will build scalable systems "
+    "python java go rust kubernetes aws gcp sql pandas spark distributed services apis customers "
+    "collaborate design review ship benefits equity health dental vision remote hybrid onsite"
+).split()
+
+
+def make_jobs(n, seed=0, start=0, sites=None, description_words=300, with_description=True, otter_rate=0.1):
+    """
+    Return n synthetic jobs with every jobspy column. Titles, companies and locations are drawn from
+    small vocabularies so that identities repeat realistically; job_urls are unique from start on.
+    A fraction otter_rate of the descriptions mention otters, which the fake LLM server rejects.
+    """
+    rng = np.random.default_rng(seed)
+    ids = np.arange(start, start + n)
+    sites = np.asarray(sites or SITES)
+    site = sites[rng.integers(0, len(sites), n)]
+    title = np.asarray(TITLES)[rng.integers(0, len(TITLES), n)]
+    level = rng.integers(1, 4, n)
+    company = np.char.add("Company ", rng.integers(0, max(10, n // 20), n).astype(str))
+    location = np.asarray(CITIES)[rng.integers(0, len(CITIES), n)]
+
+    if with_description:
+        vocabulary = np.asarray(WORDS)
+        words = vocabulary[rng.integers(0, len(vocabulary), (n, description_words))]
+        otters = rng.random(n) < otter_rate
+        description = [" ".join(row) + (" otters" if otter else "") for row, otter in zip(words, otters)]
+    else:
+        description = [None] * n
+
+    jobs = pd.DataFrame({
+        "id": [f"job-{i}" for i in ids],
+        "site": site,
+        "job_url": [f"https://{s}.example.com/jobs/{i}" for s, i in zip(site, ids)],
+        "job_url_direct": [f"https://careers.example.com/{i}" for i in ids],
+        "title": [f"{t} {lv}" if lv > 1 else t for t, lv in zip(title, level)],
+        "company": company,
+        "location": location,
+        "date_posted": pd.Timestamp("2026-01-01") + pd.to_timedelta(rng.integers(0, 30, n), unit="D"),
+        "job_type": "fulltime",
+        "salary_source": "direct_data",
+        "interval": "yearly",
+        "min_amount": rng.integers(50, 150, n) * 1000.0,
+        "max_amount": rng.integers(150, 250, n) * 1000.0,
+        "currency": "USD",
+        "is_remote": location == "Remote",
+        "description": description,
+    })
+    return jobs.reindex(columns=JOBSPY_COLUMNS)
+
+
+def make_scraped(seen_jobs, n, seed=0, seen_fraction=2 / 3):
+    """
+    Return n scraped jobs of which seen_fraction repeat seen_jobs: half of those by job_url and half by
+    identity only (new job_url, title re-cased and padded). The rest are new.
+    """
+    repeated = min(int(n * seen_fraction), len(seen_jobs))
+    by_url = seen_jobs.sample(repeated // 2, random_state=seed)
+    by_identity = seen_jobs.sample(repeated - repeated // 2, random_state=seed + 1).copy()
+    by_identity["job_url"] = [f"https://mirror.example.com/{seed}/{i}" for i in range(len(by_identity))]
+    by_identity["title"] = "  " + by_identity["title"].str.upper() + " "
+    fresh = make_jobs(n - repeated, seed=seed + 2, start=10 ** 9 + seed * n)
+    return pd.concat([by_url, by_identity, fresh], ignore_index=True)
@@ -0,0 +1,88 @@
+"""
+Command line entry point:
+
+    python cli.py scrape [--resume] [--profile] [--daemon]   scrape, filter and save new jobs (main.py)
+    python cli.py filter                                     re-apply the filters (and ranking) to the saved new jobs
+    python cli.py view                                       open the job viewer (gui.py)
+    python cli.py stats                                      count the saved, reviewed and seen jobs
+    python cli.py migrate                                    move the jobs file and seen history to the configured formats
+
+Every command imports only what it needs: the scraper (jobspy) is only imported to scrape, openai only
+when LLM filtering is enabled, and stats does not import pandas.
+"""
+import argparse
+
+CONFIG_FILE = "config.json"
+NEW_JOBS_FILE = "new_jobs.csv"
+SEEN_FILE = "seen.csv"
+
+
+def scrape(args):
+    import main
+
+    if args.daemon:
+        main.daemon(resume=args.resume)
+    elif args.profile:
+        from src.metrics import run_profiled
+        run_profiled(main.main, resume=args.resume)
+    else:
+        main.main(resume=args.resume)
+
+
+def refilter(args):
+    import main
+
+    main.refilter()
+
+
+def view(args):
+    import gui
+
+    gui.main()
+
+
+def stats(args):
+    from src.config import jobs_file_name, load_config
+    from src.stats import job_stats, print_stats
+
+    config = load_config(CONFIG_FILE)
+    jobs_file = jobs_file_name(config["storage_format"], NEW_JOBS_FILE)
+    print_stats(jobs_file, config["seen_file"], job_stats(jobs_file, config["seen_file"]))
+
+
+def migrate(args):
+    from src.config import load_config
+    from src.seen_store import open_seen_store
+    from src.utils import compact_jobs, jobs_file_path
+
+    config = load_config(CONFIG_FILE)
+    # Both migrations happen on first use; running them here just does it ahead of time.
+    jobs_file = jobs_file_path(config["storage_format"], NEW_JOBS_FILE)
+    compact_jobs(jobs_file)
+    open_seen_store(config["seen_file"], legacy_csv_path=SEEN_FILE).close()
+    print(f"Jobs are stored in {jobs_file}, the seen history in {config['seen_file']}.")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Scrape, filter and review new jobs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scrape_parser = commands.add_parser("scrape", help="Scrape, filter and save new jobs.")
+    scrape_parser.add_argument("--resume", action="store_true",
+                               help="Continue an interrupted run, redoing only the work it did not finish.")
+    scrape_parser.add_argument("--profile", action="store_true",
+                               help="Run under cProfile and tracemalloc and print the hot spots.")
+    scrape_parser.add_argument("--daemon", action="store_true",
+                               help="Keep running, scraping each search entry on its schedule.")
+    scrape_parser.set_defaults(run=scrape)
+
+    commands.add_parser("filter", help="Re-apply the configured filters to the saved new jobs.").set_defaults(run=refilter)
+    commands.add_parser("view", help="Open the job viewer.").set_defaults(run=view)
+    commands.add_parser("stats", help="Count the saved, reviewed and seen jobs.").set_defaults(run=stats)
+    commands.add_parser("migrate", help="Move the jobs file and seen history to the configured formats.").set_defaults(run=migrate)
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    args.run(args)
@@ -1,8 +1,17 @@
-import os
+import threading
 import webbrowser
+import numpy as np
 import pandas as pd
 import customtkinter as ctk
-from src.utils import save_jobs
+from src.job_source import open_job_source
+from src.job_writer import BackgroundJobWriter
+from src.search_index import SEARCH_FIELDS, JobSearchIndex
+from src.config import load_config
+from src.triage import load_llm_pending, load_reviewed
+from src.utils import jobs_file_path
+
+JOBS_FILE = "new_jobs.csv"
+CONFIG_FILE = "config.json"
 
 # -------------------------------
 # Job Viewer GUI using customtkinter
@@ -10,19 +19,50 @@ from src.utils import save_jobs
 
 
 class JobViewer(ctk.CTk):
-    def __init__(self, jobs):
+    def __init__(self, jobs, file_path=JOBS_FILE):
         super().__init__()
         self.title("Job Viewer")
-        self.geometry("850x755")
-        self.jobs = jobs
+        self.geometry("850x800")
+        # A lazy job source (see src.job_source): rows are read from the file as they are shown.
+        self.jobs = jobs if jobs is not None else []
+        self.file_path = file_path
         self.current_index = 0
+        # Deletions and reviewed marks are written by a background thread, never by the Tk main thread.
+        self.writer = BackgroundJobWriter(file_path)
+        self.reviewed = load_reviewed(file_path)
+        self.llm_pending = load_llm_pending(file_path)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Search bar: query, facet filters and the number of matches
+        self.search_index = None
+        self.facet_choices = {"company": {}, "location": {}}
+        self.search_frame = ctk.CTkFrame(self)
+        self.search_frame.pack(pady=(10, 0))
+
+        self.search_entry = ctk.CTkEntry(self.search_frame, width=330, placeholder_text="Indexing jobs...")
+        self.search_entry.configure(state="disabled")
+        self.search_entry.bind("<KeyRelease>", lambda event: self.apply_search())
+        self.search_entry.grid(row=0, column=0, padx=5)
+
+        self.company_menu = ctk.CTkOptionMenu(
+            self.search_frame, values=["All companies"], width=170, command=lambda choice: self.apply_search()
+        )
+        self.company_menu.grid(row=0, column=1, padx=5)
+
+        self.location_menu = ctk.CTkOptionMenu(
+            self.search_frame, values=["All locations"], width=170, command=lambda choice: self.apply_search()
+        )
+        self.location_menu.grid(row=0, column=2, padx=5)
+
+        self.results_label = ctk.CTkLabel(self.search_frame, text="", width=90)
+        self.results_label.grid(row=0, column=3, padx=5)
 
         # Job title
         self.title_label = ctk.CTkLabel(self, text="", font=("Roboto", 20, "bold"))
         self.title_label.pack(pady=10)
 
         # Job description
-        self.description_textbox = ctk.CTkTextbox(self, width=800, height=500)
+        self.description_textbox = ctk.CTkTextbox(self, width=800, height=480)
         self.description_textbox.pack(pady=10)
 
         # Company name
@@ -56,18 +96,34 @@ class JobViewer(ctk.CTk):
         )
         self.next_button.grid(row=0, column=2, padx=10)
 
-        # Delete button
-        self.delete_button = ctk.CTkButton(self, text="Delete", width=80, command=self.delete)
-        self.delete_button.pack(pady=2)
+        # Triage buttons frame
+        self.triage_frame = ctk.CTkFrame(self)
+        self.triage_frame.pack(pady=2)
+
+        self.delete_button = ctk.CTkButton(self.triage_frame, text="Delete", width=80, command=self.delete)
+        self.delete_button.grid(row=0, column=0, padx=10)
 
-        if not self.jobs.empty:
+        self.delete_company_button = ctk.CTkButton(
+            self.triage_frame, text="Delete All From Company", command=self.delete_company
+        )
+        self.delete_company_button.grid(row=0, column=1, padx=10)
+
+        self.review_count_entry = ctk.CTkEntry(self.triage_frame, width=50)
+        self.review_count_entry.insert(0, "10")
+        self.review_count_entry.grid(row=0, column=2, padx=(10, 2))
+
+        self.review_button = ctk.CTkButton(self.triage_frame, text="Mark Reviewed", command=self.mark_reviewed)
+        self.review_button.grid(row=0, column=3, padx=(2, 10))
+
+        if len(self.jobs) > 0:
             self.show_job(self.current_index)
+            # The index needs every title, company, location and description: build it off the main thread.
+            threading.Thread(target=self.build_search_index, daemon=True).start()
+            self.after(200, self.enable_search)
         else:
             self.title_label.configure(text="No jobs found!")
             self.description_textbox.insert("0.0", "Please scrape jobs first.")
-            self.open_link_button.configure(state="disabled")
-            self.delete_button.configure(state="disabled")
-            self.next_button.configure(state="disabled")
+            self.disable_actions()
             self.index_label.configure(text="0/0")
 
     def show_job(self, index):
@@ -75,7 +131,7 @@ class JobViewer(ctk.CTk):
         if index < 0 or index >= len(self.jobs):
             return
 
-        job = self.jobs.iloc[index]
+        job = self.jobs[index]
 
         title = job["title"] if "title" in job and pd.notna(job["title"]) else "No Title"
         description = (
@@ -91,7 +147,11 @@ class JobViewer(ctk.CTk):
         self.description_textbox.insert("0.0", description)
         self.company_label.configure(text=f"Company: {company}")
         self.location_label.configure(text=f"Location: {location}")
-        self.index_label.configure(text=f"{self.current_index}/{len(self.jobs) - 1}")
+        reviewed = " (reviewed)" if job.get("job_url") in self.reviewed else ""
+        if job.get("job_url") in self.llm_pending:
+            reviewed += " (LLM pending)"
+        score = f" - score {job['score']:.2f}" if "score" in job and pd.notna(job["score"]) else ""
+        self.index_label.configure(text=f"{self.current_index}/{len(self.jobs) - 1}{score}{reviewed}")
 
         if "job_url" in job and pd.notna(job["job_url"]) and job["job_url"].strip():
             self.open_link_button.configure(state="normal")
@@ -120,59 +180,166 @@ class JobViewer(ctk.CTk):
 
     def open_link(self):
         """Open the job's apply link in the default browser."""
-        job = self.jobs.iloc[self.current_index]
+        job = self.jobs[self.current_index]
         job_url = job["job_url"] if "job_url" in job and pd.notna(job["job_url"]) else None
         if job_url and job_url.strip():
             webbrowser.open(job_url)
         else:
             self.open_link_button.configure(state="disabled")
 
-    def delete(self):
-        """Delete the current job from the view and update the CSV file."""
-        if self.jobs.empty:
-            self.delete_button.configure(state="disabled")
-            return
-
-        self.jobs = self.jobs.drop(self.jobs.index[self.current_index]).reset_index(drop=True)
-        save_jobs("new_jobs.csv", self.jobs)
-        print(f"Deleted job at index {self.current_index}. Updated CSV saved.")
+    def build_search_index(self):
+        """Build the search index from the job source's columns (runs on a background thread)."""
+        try:
+            index = JobSearchIndex()
+            # One pass over the file. Bulk actions need company and job_url for every job, so those are kept.
+            for chunk in self.jobs.scan_columns([*SEARCH_FIELDS, "job_url"], keep=["company", "job_url"]):
+                index.add(chunk)
+            index.finish()
+            self.search_index = index
+        except Exception as e:
+            print(f"Error building the search index: {e}")
 
-        if self.current_index >= len(self.jobs) and self.current_index > 0:
-            self.current_index -= 1
+    def enable_search(self):
+        """Enable the search bar once the index is built, checking again later until then."""
+        if self.search_index is None:
+            self.after(200, self.enable_search)
+            return
+        self.search_entry.configure(state="normal", placeholder_text="Search titles, companies, descriptions...")
+        self.update_facets(np.flatnonzero(~self.jobs.deleted))
+
+    def update_facets(self, rows):
+        """Offer the companies and locations among the given rows, with their counts, in the facet menus."""
+        for field, menu, all_label in (("company", self.company_menu, "All companies"),
+                                       ("location", self.location_menu, "All locations")):
+            choices = {f"{value} ({count})": value for value, count in self.search_index.facet_counts(rows, field)}
+            current = menu.get()
+            selected = self.facet_choices[field].get(current)
+            if selected is not None and selected not in choices.values():
+                # Keep the active filter selectable even if it has no matches now.
+                choices[current] = selected
+            self.facet_choices[field] = choices
+            menu.configure(values=[all_label, *choices])
+        self.results_label.configure(text=f"{len(rows)} jobs")
+
+    def apply_search(self):
+        """Narrow navigation to the jobs matching the query and facet filters, as the user types."""
+        if self.search_index is None:
+            return
 
-        if not self.jobs.empty:
+        query = self.search_entry.get()
+        facets = {
+            "company": self.facet_choices["company"].get(self.company_menu.get()),
+            "location": self.facet_choices["location"].get(self.location_menu.get()),
+        }
+        rows = self.search_index.search(query, facets)
+        rows = rows[~self.jobs.deleted[rows]]
+        searching = bool(query.strip()) or any(value is not None for value in facets.values())
+        self.jobs.select(rows if searching else None)
+        self.update_facets(rows)
+        self.current_index = 0
+        self.refresh()
+
+    def disable_actions(self):
+        """Disable every button, once there are no jobs left."""
+        for button in (self.open_link_button, self.delete_button, self.delete_company_button,
+                       self.review_button, self.prev_button, self.next_button):
+            button.configure(state="disabled")
+
+    def refresh(self):
+        """Show the job at the current index after jobs were removed, or the empty state."""
+        if self.current_index >= len(self.jobs):
+            self.current_index = max(len(self.jobs) - 1, 0)
+
+        if len(self.jobs) > 0:
+            for button in (self.delete_button, self.delete_company_button, self.review_button):
+                button.configure(state="normal")
             self.show_job(self.current_index)
+            self.prev_button.configure(state="normal" if self.current_index > 0 else "disabled")
+            self.next_button.configure(state="normal" if self.current_index < len(self.jobs) - 1 else "disabled")
         else:
             self.title_label.configure(text="No jobs found!")
             self.description_textbox.delete("0.0", "end")
-            self.description_textbox.insert("0.0", "All jobs deleted.")
+            searching = getattr(self.jobs, "selection", None) is not None
+            self.description_textbox.insert("0.0", "No jobs match the search." if searching else "All jobs deleted.")
             self.company_label.configure(text="")
             self.location_label.configure(text="")
             self.index_label.configure(text="0/0")
-            self.open_link_button.configure(state="disabled")
+            self.disable_actions()
+
+    def delete(self):
+        """Delete the current job from the view and queue a tombstone for it in the jobs file."""
+        if len(self.jobs) == 0:
             self.delete_button.configure(state="disabled")
-            self.prev_button.configure(state="disabled")
-            self.next_button.configure(state="disabled")
+            return
+
+        job_url = self.jobs.delete(self.current_index)
+        if pd.notna(job_url):
+            self.writer.delete([job_url])
+        print(f"Deleted job at index {self.current_index}.")
+        self.refresh()
+
+    def delete_company(self):
+        """Delete every remaining job from the current job's company."""
+        if len(self.jobs) == 0:
+            return
+
+        company = self.jobs[self.current_index].get("company")
+        if pd.isna(company):
+            return
+
+        companies = pd.Series(self.jobs.column("company")).astype(str).str.strip().str.lower()
+        rows = np.flatnonzero((companies == str(company).strip().lower()).to_numpy() & ~self.jobs.deleted)
+        job_urls = self.jobs.column("job_url")[rows]
+        current_row = self.jobs.row(self.current_index)
+
+        self.jobs.delete_rows(rows)
+        self.writer.delete(job_url for job_url in job_urls if pd.notna(job_url))
+        self.current_index = self.jobs.position(current_row)
+        print(f"Deleted {len(rows)} jobs from {company}.")
+        self.refresh()
 
+    def mark_reviewed(self):
+        """Mark the current job and the ones after it (as many as the count field says) as reviewed, and move past them."""
+        if len(self.jobs) == 0:
+            return
 
-def load_jobs(file_path):
-    """Load jobs from a CSV file into a DataFrame."""
-    if os.path.exists(file_path):
         try:
-            return pd.read_csv(file_path)
-        except Exception as e:
-            print(f"Error loading jobs: {e}")
-            return pd.DataFrame()
-    else:
-        print(f"{file_path} not found.")
-        return pd.DataFrame()
+            count = max(int(self.review_count_entry.get()), 1)
+        except ValueError:
+            count = 1
+
+        stop = min(self.current_index + count, len(self.jobs))
+        rows = [self.jobs.row(index) for index in range(self.current_index, stop)]
+        job_urls = [job_url for job_url in self.jobs.column("job_url")[rows] if pd.notna(job_url)]
+        self.reviewed.update(job_urls)
+        self.writer.mark_reviewed(job_urls)
+        print(f"Marked {len(rows)} jobs as reviewed.")
+
+        self.current_index = min(stop, len(self.jobs) - 1)
+        self.refresh()
+
+    def on_close(self):
+        """Flush the queued triage actions, apply the deletions to the jobs file in one batch, then close."""
+        if hasattr(self.jobs, "close"):
+            self.jobs.close()
+        self.writer.close()
+        self.destroy()
 
 
 def main():
     ctk.set_appearance_mode("dark")
-    jobs = load_jobs("new_jobs.csv")
-    app = JobViewer(jobs)
-    app.mainloop()
+    jobs_file = jobs_file_path(load_config(CONFIG_FILE)["storage_format"], JOBS_FILE)
+    jobs = open_job_source(jobs_file)
+    app = None
+    try:
+        app = JobViewer(jobs, jobs_file)
+        app.mainloop()
+    finally:
+        # Ctrl-C or an error skips on_close: still write the triage actions and release the file.
+        if app is not None:
+            app.writer.close()
+        if jobs is not None:
+            jobs.close()
 
 
 if __name__ == "__main__":
@@ -1,29 +1,51 @@
-import pandas as pd
-from src.scraper import JobScraper
-from src.adapters import (
-    load_proxies,
-    llm_should_keep_job
-)
+import argparse
+import json
+import os
+import signal
+import time
+from src.config import load_config, load_proxies
+from src.descriptions import DescriptionFetcher
+from src.llm_cache import LLMDecisionCache
 from src.utils import (
-    load_config,
-    load_seen_jobs,
+    compact_jobs,
+    export_jobs_csv,
+    jobs_file_path,
+    load_jobs,
     save_jobs,
 )
+from src.journal import RunJournal
+from src.metrics import RunMetrics, run_profiled
+from src.near_dup import NearDuplicateIndex, filter_near_duplicates
+from src.pipeline import RunDeduplicator, stream_jobs
+from src.proxy_pool import ProxyPool
+from src.ranking import JobRanker
+from src.rules import apply_rules, load_rules
+from src.schema import compact_jobs_frame
+from src.triage import add_llm_pending, add_tombstones, load_llm_pending, save_llm_pending
+from src.seen_store import open_seen_store
+from src.site_scheduler import AdaptiveDelay
+from src.watermarks import WatermarkStore
 
 SEEN_FILE = "seen.csv"
 NEW_JOBS_FILE = "new_jobs.csv"
 CONFIG_FILE = "config.json"
 PROXIES_FILE = "proxies.txt"
+JOURNAL_DIR = "run_journal"
+# How often the daemon checks for due searches and for changes to the config file.
+DAEMON_POLL_SECONDS = 30
+# Keys of a search entry that configure the daemon rather than the scrape call.
+SCHEDULE_KEYS = ("every_minutes",)
 
 
 def call_scrape(scrape_fn, entry, defaults):
     """
-    Merge defaults with the given entry (if it is a dict) and call the provided scrape function.
+    Merge defaults with the given entry (if it is a dict), call the provided scrape function
+    and return its result.
     """
     if not isinstance(entry, dict):
-        return
-    params = {**defaults, **entry}
-    scrape_fn(**params)
+        return None
+    params = {**defaults, **{k: v for k, v in entry.items() if k not in SCHEDULE_KEYS}}
+    return scrape_fn(**params)
 
 
 def get_job_identity(job):
@@ -37,39 +59,18 @@ def get_job_identity(job):
     return (title, company, location)
 
 
-def filter_seen(scraped_jobs, seen_jobs):
+def filter_seen(scraped_jobs, seen_store):
     """
-    Given the scraped jobs DataFrame and the seen jobs DataFrame,
-    return a tuple (filtered_jobs_df, updated_seen_jobs) where:
-      - filtered_jobs_df contains only jobs that are new (i.e., whose job_url and identity are not already seen)
-      - updated_seen_jobs is the merge of the original seen_jobs and the newly filtered jobs,
-        deduplicated on the job_url.
+    Given the scraped jobs DataFrame and a seen store (see src.seen_store),
+    return the jobs that are new (i.e., whose job_url and identity are not already seen)
+    and record them in the seen store. The store persists them on commit(), once the batch is saved.
     """
-    seen_job_urls = set(seen_jobs["job_url"].dropna().tolist())
-
-    seen_identity = set(
-        (
-            row["title"].strip().lower(),
-            row["company"].strip().lower(),
-            row["location"].strip().lower(),
-        )
-        for _, row in seen_jobs.dropna(subset=["title", "company", "location"]).iterrows()
-    )
-
-    filtered_jobs = []
-    for _, job in scraped_jobs.iterrows():
-        job_url = str(job.get("job_url", "")).strip()
-        identity = get_job_identity(job)
-
-        if job_url in seen_job_urls or identity in seen_identity:
-            continue
-        filtered_jobs.append(job)
+    if scraped_jobs.empty:
+        return scraped_jobs
 
-    filtered_jobs_df = pd.DataFrame(filtered_jobs)
-    updated_seen_jobs = pd.concat([seen_jobs, filtered_jobs_df], ignore_index=True)
-    updated_seen_jobs = updated_seen_jobs.drop_duplicates(subset="job_url")
-
-    return filtered_jobs_df, updated_seen_jobs
+    filtered_jobs_df = scraped_jobs[~seen_store.is_seen(scraped_jobs).to_numpy()]
+    seen_store.add(filtered_jobs_df)
+    return filtered_jobs_df
 
 
 def filter_jobs_by_field(jobs_df, field, filter_list):
@@ -84,14 +85,63 @@ def filter_jobs_by_field(jobs_df, field, filter_list):
         return jobs_df
 
     filter_values = {x.strip().lower() for x in filter_list}
-    filtered_df = jobs_df[jobs_df[field].fillna("").apply(lambda x: x.strip().lower() not in filter_values)]
+    filtered_df = jobs_df[~jobs_df[field].astype(object).fillna("").astype(str).str.strip().str.lower().isin(filter_values)]
     return filtered_df
 
 
-def main():
-    config = load_config(CONFIG_FILE)
+def build_scraper(config, journal=None, metrics=None):
+    """
+    Create the JobScraper (with its proxy pool and watermarks, if enabled) described by the config.
+    """
+    # jobspy is slow to import, and only needed to scrape.
+    from src.scraper import JobScraper
+
     proxies = load_proxies(PROXIES_FILE)
-    scraper = JobScraper(proxies)
+    proxy_pool = None
+    if config["use_proxy_pool"]:
+        proxy_pool = ProxyPool(
+            proxies,
+            state_file=config["proxy_state_file"],
+            failure_threshold=config["proxy_failure_threshold"],
+            cooldown=config["proxy_cooldown_seconds"],
+            proxy_rate_per_minute=config["proxy_rate_per_minute"],
+            site_rate_per_minute=config["site_rate_per_minute"]
+        )
+    watermarks = None
+    if config["incremental_scraping"]:
+        watermarks = WatermarkStore(config["watermark_file"], overlap_hours=config["watermark_overlap_hours"])
+    return JobScraper(
+        proxies,
+        max_workers=config["max_workers"],
+        site_concurrency=config["site_concurrency"],
+        proxy_pool=proxy_pool,
+        watermarks=watermarks,
+        page_size=config["watermark_page_size"],
+        journal=journal,
+        metrics=metrics,
+        site_retries=config["site_retries"],
+        site_delay=AdaptiveDelay(
+            min_delay=config["site_min_delay_seconds"],
+            max_delay=config["site_max_delay_seconds"]
+        ),
+        fetch_descriptions=not config["defer_descriptions"]
+    )
+
+
+def schedule_interval(config, entry):
+    """
+    Return the seconds between daemon runs of a search entry: its every_minutes, or the config's schedule_minutes.
+    """
+    minutes = entry.get("every_minutes") if isinstance(entry, dict) else None
+    return 60 * float(minutes if minutes is not None else config["schedule_minutes"])
+
+
+def build_schedule(config, scraper):
+    """
+    Return the enabled search entries of the config, in config order, as (key, interval, tasks) triples:
+    key identifies the entry, interval is the seconds between its daemon runs and tasks are its scrape tasks.
+    """
+    schedule = []
 
     if config["search_job_boards"]:
         board_defaults = {
@@ -104,7 +154,11 @@ def main():
             "distance": 200
         }
         for entry in config["board_search_terms"]:
-            call_scrape(scraper.scrape_job_board_jobs, entry, board_defaults)
+            schedule.append((
+                json.dumps(["board", entry], sort_keys=True),
+                schedule_interval(config, entry),
+                call_scrape(scraper.board_tasks, entry, board_defaults) or []
+            ))
 
     if config["search_google_jobs"]:
         google_defaults = {
@@ -112,14 +166,27 @@ def main():
             "results_wanted": 20
         }
         for entry in config["google_search_terms"]:
-            call_scrape(scraper.scrape_google_jobs, entry, google_defaults)
+            schedule.append((
+                json.dumps(["google", entry], sort_keys=True),
+                schedule_interval(config, entry),
+                call_scrape(scraper.google_tasks, entry, google_defaults) or []
+            ))
 
-    scraper.drop_duplicates()
-    seen_jobs = load_seen_jobs(SEEN_FILE)
-    filtered_jobs_df, updated_seen_jobs = filter_seen(scraper.new_jobs, seen_jobs)
+    return schedule
+
+
+def build_tasks(config, scraper):
+    """
+    Return the scrape tasks for every enabled search entry in the config, in config order.
+    """
+    return [task for _, _, tasks in build_schedule(config, scraper) for task in tasks]
 
-    print(f"After filtering seen jobs, {len(filtered_jobs_df)} jobs remain.")
 
+def field_filter_stages(config):
+    """
+    Return the stages of the enabled location, title and company filters.
+    """
+    stages = []
     filter_criteria = [
         ("location", "filter_locations", "locations_to_filter"),
         ("title", "filter_job_titles", "job_titles_to_filter"),
@@ -128,30 +195,407 @@ def main():
 
     for field, flag_key, values_key in filter_criteria:
         if config[flag_key]:
-            filtered_jobs_df = filter_jobs_by_field(filtered_jobs_df, field, config[values_key])
+            stages.append((
+                f"{field} filters",
+                lambda jobs, field=field, values=config[values_key]: filter_jobs_by_field(jobs, field, values)
+            ))
+    return stages
+
+
+def decision_stages(config, llm_filter=None, ranker=None):
+    """
+    Return the stages that read descriptions to decide on a job: the keyword rules, the relevance ranking
+    and the LLM filter. With an LLM budget, leave llm_filter out and use check_pending_jobs instead.
+    """
+    stages = []
+    if config["filter_with_rules"]:
+        rules = load_rules(config["filter_rules"])
+        stages.append(("keyword rules", lambda jobs: apply_rules(jobs, rules)))
 
-            print(f"After applying {field} filters, {len(filtered_jobs_df)} jobs remain.")
+    if ranker is not None:
+        stages.append(("relevance ranking", ranker))
+
+    if llm_filter is not None:
+        stages.append(("LLM filtering", lambda jobs: jobs[llm_filter.filter(jobs)]))
+    return stages
+
+
+def build_stages(config, seen_store, near_duplicate_index=None, llm_filter=None, description_fetcher=None,
+                 ranker=None):
+    """
+    Return the pipeline stages, as (name, function) pairs, that every batch of scraped jobs goes through.
+    With a description fetcher (deferred descriptions), the field filters run before it and the stages
+    that read descriptions (near-duplicates, keyword rules, LLM) after it.
+    """
+    stages = [
+        ("compact schema", lambda jobs: compact_jobs_frame(jobs, config["job_columns"])),
+        ("run deduplication", RunDeduplicator()),
+        ("seen filter", lambda jobs: filter_seen(jobs, seen_store)),
+    ]
+    field_stages = field_filter_stages(config)
+
+    if description_fetcher is not None:
+        stages.extend(field_stages)
+        stages.append(("description fetch", description_fetcher))
+    if near_duplicate_index is not None:
+        stages.append(("near-duplicate filter", lambda jobs: filter_near_duplicates(jobs, near_duplicate_index)))
+    if description_fetcher is None:
+        stages.extend(field_stages)
+
+    stages.extend(decision_stages(config, llm_filter, ranker))
+    return stages
+
+
+def build_ranker(config):
+    """
+    Return the JobRanker for the config's ranking profile, or None if ranking is disabled.
+    """
+    if not config["rank_jobs"]:
+        return None
+    return JobRanker.from_profile(config["ranking_profile"])
+
+
+def build_llm_budget(config):
+    """
+    Return a fresh LLMBudget for one run, or None if the config sets no limit.
+    """
+    if config["llm_max_jobs_per_run"] is None and config["llm_max_cost_per_run"] is None:
+        return None
+    from src.llm_filter import LLMBudget
+
+    return LLMBudget(
+        max_jobs=config["llm_max_jobs_per_run"],
+        max_cost=config["llm_max_cost_per_run"],
+        cost_per_million_tokens=config["llm_cost_per_million_tokens"]
+    )
 
-    if config["filter_with_llm"]:
-        print("Beginning LLM filtering...")
 
-        llm_filtered_jobs = []
-        for _, job in filtered_jobs_df.iterrows():
-            if llm_should_keep_job(
-                config["llm_api_key"],
-                config["llm_prompt"],
-                job.get("title", ""),
-                job.get("location", ""),
-                job.get("description", "")
-            ):
-                llm_filtered_jobs.append(job)
+def check_pending_jobs(jobs_file, llm_filter, budget):
+    """
+    Send the saved jobs that wait for an LLM decision to the LLM, best score first, as far as the budget goes.
+    Rejected jobs are deleted (tombstones), decided ones leave the pending list, and the others stay pending
+    for the next run. Returns the number of jobs deleted.
+    """
+    pending = load_llm_pending(jobs_file)
+    if not pending:
+        return 0
+    jobs = load_jobs(jobs_file)
+    if jobs.empty:
+        save_llm_pending(jobs_file, set())
+        return 0
+    jobs = jobs[jobs["job_url"].isin(pending)]
+    if "score" in jobs.columns:
+        jobs = jobs.sort_values("score", ascending=False, kind="stable", na_position="last")
+
+    llm_filter.budget = budget
+    decisions = llm_filter.decide(jobs)
+    decided = decisions.notna()
+    rejected = decisions.eq(False)
+    add_tombstones(jobs_file, jobs.loc[rejected, "job_url"])
+    # Jobs deleted since they were saved drop out of the list too.
+    save_llm_pending(jobs_file, set(jobs.loc[~decided, "job_url"]))
+    print(f"[LLM] {decided.sum()} of {len(jobs)} pending jobs checked, {rejected.sum()} filtered out; "
+          f"{len(jobs) - decided.sum()} still pending.")
+    return int(rejected.sum())
+
+
+def build_llm_filter(config):
+    """
+    Return the LLM decision cache and the LLM filter described by the config, or (None, None)
+    if LLM filtering is disabled.
+    """
+    if not config["filter_with_llm"]:
+        return None, None
+    # openai is only imported when LLM filtering is enabled.
+    from src.llm_filter import AsyncLLMFilter
+
+    llm_cache = None
+    if config["llm_cache_file"]:
+        llm_cache = LLMDecisionCache(
+            config["llm_cache_file"],
+            max_entries=config["llm_cache_max_entries"],
+            max_age_days=config["llm_cache_max_age_days"]
+        )
+    llm_filter = AsyncLLMFilter(
+        config["llm_api_key"],
+        config["llm_prompt"],
+        model=config["llm_model"],
+        base_url=config["llm_base_url"],
+        max_concurrency=config["llm_max_concurrency"],
+        batch_size=config["llm_batch_size"],
+        cache=llm_cache
+    )
+    return llm_cache, llm_filter
+
+
+class Pipeline:
+    """
+    The long-lived parts of a run, opened once from the config: the scraper (with its proxy pool and
+    watermarks), the seen store, the near-duplicate index and the LLM filter with its cache.
+    A one-shot run uses it once; the daemon keeps it, and the state it holds, warm across runs.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.scraper = build_scraper(config)
+        self.jobs_file = jobs_file_path(config["storage_format"], NEW_JOBS_FILE)
+        self.seen_store = open_seen_store(config["seen_file"], legacy_csv_path=SEEN_FILE)
+
+        self.near_duplicate_index = None
+        if config["filter_near_duplicates"]:
+            self.near_duplicate_index = NearDuplicateIndex(
+                config["near_duplicate_file"],
+                threshold=config["near_duplicate_threshold"]
+            )
+
+        self.description_fetcher = None
+        if config["defer_descriptions"]:
+            self.description_fetcher = DescriptionFetcher(
+                self.scraper.proxies,
+                proxy_pool=self.scraper.proxy_pool,
+                max_workers=config["description_fetch_concurrency"]
+            )
+
+        self.llm_cache, self.llm_filter = build_llm_filter(config)
+        self.ranker = build_ranker(config)
+
+    def run(self, tasks, journal, metrics):
+        """
+        Scrape the tasks that the journal does not record as done, stream them through the filter
+        stages and append the kept jobs to the jobs file as each batch arrives. Returns the number kept.
+        """
+        self.scraper.journal = journal
+        self.scraper.metrics = metrics
+        journal.cache = self.llm_cache
+        budget = None
+        if self.llm_filter is not None:
+            self.llm_filter.cache = journal
+            self.llm_filter.metrics = metrics
+            budget = build_llm_budget(self.config)
+        if self.description_fetcher is not None:
+            self.description_fetcher.metrics = metrics
+        # With a budget, the LLM only sees the best jobs of the whole run, once scraping is over:
+        # until then the kept jobs are saved as pending an LLM decision.
+        defer_llm = budget is not None
+        # Fresh stages per run, so that run deduplication only remembers this run's jobs.
+        stages = build_stages(
+            self.config, self.seen_store, self.near_duplicate_index, None if defer_llm else self.llm_filter,
+            self.description_fetcher, self.ranker
+        )
+
+        remaining_tasks = [task for task in tasks if not journal.is_done(task)]
+        if len(remaining_tasks) < len(tasks):
+            print(f"Skipping {len(tasks) - len(remaining_tasks)} scrape tasks completed before the interruption.")
+
+        kept_jobs = 0
+        for jobs in stream_jobs(self.scraper.iter_tasks(remaining_tasks), stages, metrics):
+            # Kept jobs are written before the seen history is committed, and a failed run rolls back what it
+            # did not commit (see Pipeline.rollback), so a crash never loses a kept job.
+            start = time.perf_counter()
+            if not jobs.empty:
+                if defer_llm:
+                    add_llm_pending(self.jobs_file, jobs["job_url"].dropna())
+                save_jobs(self.jobs_file, jobs, append=True)
+                kept_jobs += len(jobs)
+            self.seen_store.commit()
+            if self.near_duplicate_index is not None:
+                self.near_duplicate_index.commit()
+            metrics.record_stage("save", time.perf_counter() - start, len(jobs), len(jobs))
+        if defer_llm:
+            # Also picks up the jobs left pending by earlier runs.
+            start = time.perf_counter()
+            kept_jobs -= check_pending_jobs(self.jobs_file, self.llm_filter, budget)
+            metrics.record_stage("LLM pending check", time.perf_counter() - start, budget.jobs, budget.jobs)
+            print(f"[LLM] Budget: {budget.jobs} jobs sent (~${budget.cost:.4f}), {budget.skipped} left pending.")
+        journal.finish()
+        return kept_jobs
+
+    def save(self):
+        """
+        Persist the proxy and watermark state, which the daemon does after every run.
+        """
+        if self.scraper.proxy_pool is not None:
+            self.scraper.proxy_pool.save()
+        if self.scraper.watermarks is not None:
+            self.scraper.watermarks.save()
+
+    def rollback(self):
+        """
+        Forget the seen jobs and near-duplicate signatures recorded since the last saved batch, after a run
+        failed or was interrupted: that batch was never saved, so it must not count as seen when it is scraped
+        again (or replayed by --resume).
+        """
+        self.seen_store.rollback()
+        if self.near_duplicate_index is not None:
+            self.near_duplicate_index.rollback()
+
+    def close(self):
+        self.save()
+        self.seen_store.close()
+        if self.near_duplicate_index is not None:
+            self.near_duplicate_index.close()
+        if self.llm_cache is not None:
+            self.llm_cache.report()
+            self.llm_cache.close()
+
+
+def run_once(pipeline, tasks, resume=False):
+    """
+    Run the pipeline over the tasks with a fresh journal and metrics, report the metrics and
+    return the number of jobs kept.
+    """
+    config = pipeline.config
+    metrics = RunMetrics()
+    journal = RunJournal(JOURNAL_DIR, resume=resume)
+    try:
+        kept_jobs = pipeline.run(tasks, journal, metrics)
+    finally:
+        journal.close()
+        pipeline.save()
+        metrics.print_summary()
+        if config["run_report_file"]:
+            metrics.write_report(config["run_report_file"])
+        if config["prometheus_textfile"]:
+            metrics.write_prometheus(config["prometheus_textfile"])
+
+    print(f"Run over: {kept_jobs} new jobs saved to {pipeline.jobs_file}.")
+    return kept_jobs
+
+
+def main(resume=False):
+    config = load_config(CONFIG_FILE)
+    pipeline = Pipeline(config)
+    try:
+        run_once(pipeline, build_tasks(config, pipeline.scraper), resume=resume)
+    except BaseException:
+        pipeline.rollback()
+        raise
+    finally:
+        pipeline.close()
+
+
+def refilter():
+    """
+    Re-apply the configured field filters, keyword rules, ranking and LLM filter to the saved new jobs
+    (e.g. after changing them), rewriting the jobs file with the jobs that still pass.
+    """
+    config = load_config(CONFIG_FILE)
+    jobs_file = jobs_file_path(config["storage_format"], NEW_JOBS_FILE)
+    compact_jobs(jobs_file)
+    jobs = load_jobs(jobs_file)
+    if jobs.empty:
+        return
+
+    llm_cache, llm_filter = build_llm_filter(config)
+    budget = build_llm_budget(config) if llm_filter is not None else None
+    ranker = build_ranker(config)
+    try:
+        kept = jobs
+        stages = field_filter_stages(config) + decision_stages(config, None if budget else llm_filter, ranker)
+        for name, stage in stages:
+            before = len(kept)
+            kept = stage(kept)
+            print(f"[FILTER] {name}: {before} -> {len(kept)} jobs.")
+
+        filtered_out = jobs.loc[~jobs.index.isin(kept.index), "job_url"].dropna()
+        removed = len(filtered_out)
+        if ranker is not None and not kept.empty:
+            # Rewritten with the new scores, best first.
+            save_jobs(jobs_file, kept.reset_index(drop=True))
+        elif not filtered_out.empty:
+            # Filtered out jobs are deleted like in the GUI: tombstones, applied in one rewrite.
+            add_tombstones(jobs_file, filtered_out)
+            compact_jobs(jobs_file)
+        if budget is not None:
+            # The LLM checks the best jobs within the budget; the rest wait for the next run or refilter.
+            save_llm_pending(jobs_file, load_llm_pending(jobs_file) | set(kept["job_url"].dropna()))
+            removed += check_pending_jobs(jobs_file, llm_filter, budget)
+    finally:
+        if llm_cache is not None:
+            llm_cache.report()
+            llm_cache.close()
+    print(f"Refiltered {jobs_file}: {removed} of {len(jobs)} jobs filtered out.")
+
+
+def _stop_on_sigterm(signum, frame):
+    # Turn SIGTERM (e.g. from systemd or docker stop) into the same clean shutdown as Ctrl-C.
+    raise KeyboardInterrupt
+
+
+def daemon(resume=False):
+    """
+    Stay up and run every search entry on its own schedule (its every_minutes, or schedule_minutes),
+    keeping the pipeline's state warm in memory between runs. config.json is reloaded when it changes;
+    entries whose settings did not change keep their schedule. A failed run is logged and the schedule goes on.
+    SIGTERM and Ctrl-C stop the daemon after closing the stores.
+    """
+    signal.signal(signal.SIGTERM, _stop_on_sigterm)
+    config_mtime = os.path.getmtime(CONFIG_FILE)
+    config = load_config(CONFIG_FILE)
+    pipeline = Pipeline(config)
+    next_due = {}
+    print(f"[DAEMON] Started, polling every {DAEMON_POLL_SECONDS}s.")
+
+    try:
+        while True:
+            mtime = os.path.getmtime(CONFIG_FILE)
+            if mtime != config_mtime:
+                config_mtime = mtime
+                try:
+                    new_config = load_config(CONFIG_FILE)
+                except Exception as e:
+                    print(f"[DAEMON] Keeping the previous config, {CONFIG_FILE} is invalid: {e}")
+                else:
+                    print(f"[DAEMON] {CONFIG_FILE} changed, reloading.")
+                    pipeline.close()
+                    config = new_config
+                    pipeline = Pipeline(config)
 
-        filtered_jobs_df = pd.DataFrame(llm_filtered_jobs)
-        print(f"After LLM filtering, {len(filtered_jobs_df)} jobs remain.")
+            now = time.time()
+            schedule = build_schedule(config, pipeline.scraper)
+            due = [(key, interval, tasks) for key, interval, tasks in schedule if next_due.get(key, 0) <= now]
+            if due:
+                print(f"[DAEMON] Running {len(due)} due search entries.")
+                try:
+                    run_once(pipeline, [task for _, _, tasks in due for task in tasks], resume=resume)
+                except KeyboardInterrupt:
+                    pipeline.rollback()
+                    raise
+                except Exception as e:
+                    # The due entries are retried at their next due time; what the failed batch recorded
+                    # as seen is forgotten first, or those postings would never be saved.
+                    print(f"[DAEMON] Run failed: {e!r}")
+                    pipeline.rollback()
+                resume = False
+                for key, interval, _ in due:
+                    next_due[key] = now + interval
 
-    save_jobs(NEW_JOBS_FILE, filtered_jobs_df, append=True)
-    save_jobs(SEEN_FILE, updated_seen_jobs)
+            keys = {key for key, _, _ in schedule}
+            next_due = {key: due_time for key, due_time in next_due.items() if key in keys}
+            wake = min(next_due.values(), default=now + DAEMON_POLL_SECONDS)
+            time.sleep(min(max(wake - time.time(), 1), DAEMON_POLL_SECONDS))
+    except KeyboardInterrupt:
+        print("[DAEMON] Stopping.")
+    finally:
+        pipeline.close()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Scrape, filter and save new jobs.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run, redoing only the work it did not finish.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run under cProfile and tracemalloc and print the hot spots.")
+    parser.add_argument("--export-csv", metavar="FILE",
+                        help="Export the saved new jobs to a CSV file instead of running.")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Keep running, scraping each search entry on its schedule.")
+    args = parser.parse_args()
+    if args.export_csv:
+        export_jobs_csv(jobs_file_path(load_config(CONFIG_FILE)["storage_format"], NEW_JOBS_FILE), args.export_csv)
+    elif args.daemon:
+        daemon(resume=args.resume)
+    elif args.profile:
+        run_profiled(main, resume=args.resume)
+    else:
+        main(resume=args.resume)
@@ -5,22 +5,37 @@ rm -rf backups/*
 
 TIMESTAMP=$(date +"%Y%m%d_%H%M%S")
 
-if [ -f "seen.csv" ]; then
-    cp seen.csv "backups/seen_$TIMESTAMP.csv"
-    echo "Backed up seen.csv to backups/seen_$TIMESTAMP.csv"
-else
-    echo "seen.csv does not exist, skipping backup for seen.csv"
-fi
+# Copy a file, or a directory such as a Parquet dataset, to backups/<name>_<timestamp>.<extension>.
+backup() {
+    local name="$1"
+    local target="backups/${name%%.*}_$TIMESTAMP.${name#*.}"
+    if [ -e "$name" ]; then
+        cp -r "$name" "$target"
+        echo "Backed up $name to $target"
+    else
+        echo "$name does not exist, skipping backup for $name"
+    fi
+}
 
-if [ -f "new_jobs.csv" ]; then
-    cp new_jobs.csv "backups/new_jobs_$TIMESTAMP.csv"
-    echo "Backed up new_jobs.csv to backups/new_jobs_$TIMESTAMP.csv"
-else
-    echo "new_jobs.csv does not exist, skipping backup for new_jobs.csv"
-fi
+# Seen history (CSV, SQLite or Parquet), near-duplicate index and LLM decision cache.
+backup seen.csv
+backup seen.db
+backup seen.parquet
+backup seen_minhash.db
+backup llm_cache.db
+
+# New jobs (CSV or Parquet) with their deletions, reviewed marks and pending LLM decisions.
+for jobs_file in new_jobs.csv new_jobs.parquet; do
+    backup "$jobs_file"
+    for side_file in deleted reviewed llm_pending; do
+        if [ -e "$jobs_file" ] || [ -e "$jobs_file.$side_file" ]; then
+            backup "$jobs_file.$side_file"
+        fi
+    done
+done
 
 echo "Running scraper..."
-python3 main.py
+python3 main.py "$@"
 echo "Scraper run over."
 
 echo "Opening GUI"
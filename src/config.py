@@ -0,0 +1,166 @@
+import os
+import json
+
+
+def load_config(file_path):
+    """
+    Load the configuration from a JSON file.
+    """
+    if not os.path.exists(file_path):
+        raise Exception(f"{file_path} not found. You are probably calling main.py from outside of the project folder.")
+
+    with open(file_path, "r") as f:
+        config = json.load(f)
+
+    config["search_job_boards"] = config.get("search_job_boards", False)
+    config["search_google_jobs"] = config.get("search_google_jobs", False)
+
+    config["board_search_terms"] = config.get("board_search_terms", [])
+    config["google_search_terms"] = config.get("google_search_terms", [])
+
+    # Storage format of the new jobs file: "csv" or "parquet" (compressed and columnar, needs pyarrow).
+    config["storage_format"] = config.get("storage_format", "csv")
+    if config["storage_format"] not in ("csv", "parquet"):
+        raise Exception(f'Unknown storage_format "{config["storage_format"]}", expected "csv" or "parquet".')
+
+    # Columns kept of scraped jobs (null for the defaults in src/schema.py); the required ones are always kept.
+    config["job_columns"] = config.get("job_columns", None)
+
+    # Seen history: a .db/.sqlite file uses the SQLite seen store, a .parquet one the Parquet store,
+    # anything else a CSV file.
+    default_seen_file = "seen.parquet" if config["storage_format"] == "parquet" else "seen.csv"
+    config["seen_file"] = config.get("seen_file", default_seen_file)
+
+    # Near-duplicate detection across boards, indexed in its own SQLite file next to the seen history.
+    config["filter_near_duplicates"] = config.get("filter_near_duplicates", False)
+    config["near_duplicate_file"] = config.get("near_duplicate_file", "seen_minhash.db")
+    config["near_duplicate_threshold"] = config.get("near_duplicate_threshold", 0.8)
+
+    # Proxy pool: health tracking, circuit breaking and rate limits per proxy and per site.
+    config["use_proxy_pool"] = config.get("use_proxy_pool", False)
+    config["proxy_state_file"] = config.get("proxy_state_file", "proxy_state.json")
+    config["proxy_failure_threshold"] = config.get("proxy_failure_threshold", 3)
+    config["proxy_cooldown_seconds"] = config.get("proxy_cooldown_seconds", 300)
+    config["proxy_rate_per_minute"] = config.get("proxy_rate_per_minute", None)
+    config["site_rate_per_minute"] = config.get("site_rate_per_minute", {})
+
+    # Incremental scraping: narrow hours_old and stop paging at postings seen by the previous run.
+    config["incremental_scraping"] = config.get("incremental_scraping", False)
+    config["watermark_file"] = config.get("watermark_file", "watermarks.json")
+    config["watermark_overlap_hours"] = config.get("watermark_overlap_hours", 24)
+    config["watermark_page_size"] = config.get("watermark_page_size", 25)
+
+    # Daemon mode (main.py --daemon): minutes between runs of a search entry without its own every_minutes.
+    config["schedule_minutes"] = config.get("schedule_minutes", 60)
+
+    # Run report (JSON lines, appended every run) and optional Prometheus textfile export.
+    config["run_report_file"] = config.get("run_report_file", "run_report.jsonl")
+    config["prometheus_textfile"] = config.get("prometheus_textfile", None)
+
+    # Concurrency options.
+    config["max_workers"] = config.get("max_workers", 1)
+    config["site_concurrency"] = config.get("site_concurrency", {})
+
+    # Deferred descriptions: scrape LinkedIn listings without descriptions, and fetch them only for the jobs
+    # that pass the seen check and the field filters.
+    config["defer_descriptions"] = config.get("defer_descriptions", False)
+    config["description_fetch_concurrency"] = config.get("description_fetch_concurrency", 4)
+
+    # Per-site politeness: retries of a failed site, and the bounds of the adaptive delay between its calls.
+    config["site_retries"] = config.get("site_retries", 2)
+    config["site_min_delay_seconds"] = config.get("site_min_delay_seconds", 0)
+    config["site_max_delay_seconds"] = config.get("site_max_delay_seconds", 120)
+
+    # Filter options.
+    config["filter_locations"] = config.get("filter_locations", False)
+    config["locations_to_filter"] = config.get("locations_to_filter", [])
+    config["filter_job_titles"] = config.get("filter_job_titles", False)
+    config["job_titles_to_filter"] = config.get("job_titles_to_filter", [])
+    config["filter_companies"] = config.get("filter_companies", False)
+    config["companies_to_filter"] = config.get("companies_to_filter", [])
+    config["filter_with_rules"] = config.get("filter_with_rules", False)
+    config["filter_rules"] = config.get("filter_rules", [])
+    config["filter_with_llm"] = config.get("filter_with_llm", False)
+    config["llm_api_key"] = config.get("llm_api_key", "")
+    config["llm_prompt"] = config.get("llm_prompt", "")
+    config["llm_model"] = config.get("llm_model", "gpt-4o-mini")
+    config["llm_base_url"] = config.get("llm_base_url", None)
+    config["llm_max_concurrency"] = config.get("llm_max_concurrency", 8)
+    config["llm_batch_size"] = config.get("llm_batch_size", 1)
+    config["llm_cache_file"] = config.get("llm_cache_file", "llm_cache.db")
+    config["llm_cache_max_entries"] = config.get("llm_cache_max_entries", 100000)
+    config["llm_cache_max_age_days"] = config.get("llm_cache_max_age_days", 30)
+    # LLM budget per run (null for no limit): jobs sent to the LLM, and their estimated cost in dollars.
+    # With a budget, the best jobs of the run are checked after scraping; the rest stay pending for later runs.
+    config["llm_max_jobs_per_run"] = config.get("llm_max_jobs_per_run", None)
+    config["llm_max_cost_per_run"] = config.get("llm_max_cost_per_run", None)
+    config["llm_cost_per_million_tokens"] = config.get("llm_cost_per_million_tokens", 0.15)
+
+    # Relevance ranking: score jobs against ranking_profile (keywords, liked_jobs, preferred_companies,
+    # preferred_locations), send the best ones to the LLM first and show the best ones first in the viewer.
+    config["rank_jobs"] = config.get("rank_jobs", False)
+    config["ranking_profile"] = config.get("ranking_profile", {})
+
+    return config
+
+
+def jobs_file_name(storage_format, csv_path="new_jobs.csv"):
+    """
+    Return the name of the new jobs file for the given storage format (see src.utils.jobs_file_path,
+    which also migrates an existing CSV file).
+    """
+    if storage_format != "parquet":
+        return csv_path
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def _transform_proxy_line(line: str) -> str:
+    """
+    MODIFY THIS if your proxies are in a different format.
+    Transforms a proxy line from various formats to the format expected by the job scraper: 'user:pass@host:port'.
+
+    Expected input formats:
+      - "host:port:user:pass"  (will be transformed to "user:pass@host:port")
+      - "user:pass@host:port"  (assumed to be already in the correct format)
+
+    If the line does not match known formats, this function returns None.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    if "@" in line:
+        return line
+
+    parts = line.split(":")
+    if len(parts) == 4:
+        host, port, user, password = parts
+        return f"{user}:{password}@{host}:{port}"
+
+    print(f"Invalid proxy format: {line}")
+    return None
+
+
+def load_proxies(file_path: str) -> list:
+    """
+    Load proxies from a text file, one per line, transforming each line to the format:
+      'user:pass@host:port'
+
+    If the file does not exist or no valid proxies are found, return ["localhost"].
+    """
+    if not os.path.exists(file_path):
+        print(f"{file_path} not found. Using 'localhost' as proxy.")
+        return ["localhost"]
+
+    proxies = []
+    with open(file_path, "r") as f:
+        for line in f:
+            transformed = _transform_proxy_line(line)
+            if transformed:
+                proxies.append(transformed)
+    if not proxies:
+        print(f"No valid proxies found in {file_path}. Using 'localhost' as proxy.")
+        return ["localhost"]
+
+    print(f"Loaded {len(proxies)} proxies from {file_path}.")
+    return proxies
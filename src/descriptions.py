@@ -0,0 +1,113 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0.0.0 Safari/537.36"
+)
+
+
+def fetch_linkedin_description(session, job_url, proxies=None, timeout=15):
+    """
+    Fetch a LinkedIn job page and return its description as plain text, or None if the page has none.
+    Raises on network errors and non-200 responses.
+    """
+    from bs4 import BeautifulSoup
+
+    response = session.get(job_url, proxies=proxies, timeout=timeout, headers={"user-agent": USER_AGENT})
+    if response.status_code != 200:
+        raise Exception(f"LinkedIn responded {response.status_code} for {job_url}")
+    soup = BeautifulSoup(response.text, "html.parser")
+    markup = soup.find("div", class_="show-more-less-html__markup")
+    return markup.get_text("\n", strip=True) if markup else None
+
+
+# Sites whose listings come without descriptions unless asked for, and how to fetch one afterwards.
+FETCHERS = {
+    "linkedin": fetch_linkedin_description,
+}
+
+
+class DescriptionFetcher:
+    """
+    Pipeline stage for deferred descriptions: fills in the missing descriptions of jobs from the sites in
+    FETCHERS, one job page per job, with up to max_workers pages in flight. It runs after the cheap filters,
+    so only the jobs that survive them cost a request. With a proxy pool, every request goes through a proxy
+    picked (and rate limited) by the pool; otherwise the scraper's proxies are used in turn.
+    A job whose page cannot be fetched is kept without a description.
+    """
+
+    def __init__(self, proxies=None, proxy_pool=None, max_workers=4, metrics=None):
+        self.proxies = [p for p in (proxies or []) if p and p != "localhost"]
+        self.proxy_pool = proxy_pool
+        self.max_workers = max(1, int(max_workers))
+        self.metrics = metrics
+        self._local = threading.local()
+        self._next_proxy = 0
+        self._lock = threading.Lock()
+
+    def _session(self):
+        if not hasattr(self._local, "session"):
+            import requests
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _pick_proxy(self, site):
+        if self.proxy_pool is not None:
+            return self.proxy_pool.acquire((site,))
+        if not self.proxies:
+            return None
+        with self._lock:
+            proxy = self.proxies[self._next_proxy % len(self.proxies)]
+            self._next_proxy += 1
+        return proxy
+
+    def _fetch(self, site, job_url):
+        proxy = None
+        start = time.monotonic()
+        try:
+            proxy = self._pick_proxy(site)
+            start = time.monotonic()
+            # "localhost" is load_proxies' placeholder for "no proxy" (as for jobspy), never a real proxy.
+            use_proxy = proxy and proxy != "localhost"
+            proxies = {"http": f"http://{proxy}", "https": f"http://{proxy}"} if use_proxy else None
+            description = FETCHERS[site](self._session(), job_url, proxies=proxies)
+            if proxy and self.proxy_pool is not None:
+                self.proxy_pool.report(proxy, success=True, latency=time.monotonic() - start)
+            return description
+        except Exception as e:
+            print(f"Error fetching the description of {job_url}: {e}")
+            if proxy and self.proxy_pool is not None:
+                self.proxy_pool.report(proxy, success=False, latency=time.monotonic() - start)
+            return None
+
+    def __call__(self, jobs):
+        if jobs.empty or "site" not in jobs.columns or "job_url" not in jobs.columns:
+            return jobs
+
+        descriptions = jobs["description"] if "description" in jobs.columns else pd.Series(None, index=jobs.index)
+        missing = (
+            jobs["site"].isin(list(FETCHERS))
+            & jobs["job_url"].notna()
+            & descriptions.fillna("").astype(str).str.strip().eq("")
+        )
+        if not missing.any():
+            return jobs
+
+        todo = jobs.loc[missing, ["site", "job_url"]]
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            fetched = list(executor.map(self._fetch, todo["site"], todo["job_url"]))
+        found = sum(description is not None for description in fetched)
+        if self.metrics is not None:
+            self.metrics.record_site(("descriptions",), time.monotonic() - start, found, ok=True, calls=len(fetched))
+        print(f"[DESCRIPTIONS] Fetched {found} of {len(fetched)} missing descriptions.")
+
+        jobs = jobs.copy()
+        if "description" not in jobs.columns:
+            jobs["description"] = None
+        jobs["description"] = jobs["description"].astype(object)
+        jobs.loc[todo.index, "description"] = pd.Series(fetched, index=todo.index, dtype=object)
+        return jobs
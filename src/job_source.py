@@ -0,0 +1,405 @@
+import io
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from src.parquet_store import is_parquet, part_paths, require_pyarrow
+from src.triage import load_tombstones
+from src.utils import compact_jobs
+
+# Rows are fetched a page at a time; this many pages stay cached.
+PAGE_SIZE = 50
+CACHED_PAGES = 8
+
+# The CSV scan reads this many bytes at a time.
+_SCAN_CHUNK = 64 * 1024 * 1024
+# Whole columns are read this many rows at a time.
+_SCAN_ROWS = 10_000
+# Bytes at each end of the indexed region remembered to detect that a CSV file was only appended to.
+_TAIL_BYTES = 4096
+# Jobs are viewed best first by this column (see src.ranking) when the file has it.
+SORT_COLUMN = "score"
+
+
+def _row_offsets(data, start, end, quoted):
+    """
+    Return the offsets of the row starts in data[start:end] of a CSV file written with doubled quotes:
+    every newline outside quotes ends a row. quoted tells whether start lies inside a quoted field;
+    returns the offsets and the quoted state at end.
+    """
+    offsets = []
+    for chunk_start in range(start, end, _SCAN_CHUNK):
+        chunk = np.frombuffer(data, dtype=np.uint8, count=min(_SCAN_CHUNK, end - chunk_start), offset=chunk_start)
+        quotes = np.flatnonzero(chunk == ord('"'))
+        newlines = np.flatnonzero(chunk == ord("\n"))
+        # A newline ends a row when an even number of quotes precedes it (odd if the chunk starts quoted).
+        outside = (np.searchsorted(quotes, newlines) + quoted) % 2 == 0
+        offsets.append(newlines[outside] + chunk_start + 1)
+        quoted = (quoted + len(quotes)) % 2
+    if not offsets:
+        return np.empty(0, dtype=np.int64), quoted
+    return np.concatenate(offsets).astype(np.int64), quoted
+
+
+class _PagedJobSource:
+    """
+    Base of the lazy job sources: random access to the jobs of a jobs file by position, a page of
+    PAGE_SIZE rows at a time, with an LRU cache of pages and a background thread that prefetches
+    the pages around the one being viewed. Subclasses provide _row_count(), _read_rows(start, stop),
+    _scan_columns(names) and _sort_values().
+    Positions follow SORT_COLUMN, highest first, so runs never rewrite the file to sort it.
+    Deleted rows are flagged in a bitmap (one byte per row) without touching the file; positions
+    skip them, and only cover the selected rows if a selection is set. The caller records the tombstones.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._pages = OrderedDict()
+        self._columns = {}
+        self._lock = threading.Lock()
+        self._loading = {}
+        self._prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-prefetch")
+        self.deleted = None  # Set by subclasses once the row count is known.
+        self.selection = None  # Sorted rows a search narrowed the view to, or None for all rows.
+        self.order = None  # File rows in viewing order, or None for file order.
+        self._ranks = None  # The position of every file row in order.
+        self._visible = None
+
+    def _init_rows(self):
+        self.deleted = np.zeros(self._row_count(), dtype=bool)
+        values = pd.Series(self._sort_values(), dtype=float)
+        if values.notna().any():
+            order = values.sort_values(ascending=False, kind="stable", na_position="last").index.to_numpy()
+            if (order != np.arange(len(order))).any():
+                self.order = order
+                self._ranks = np.empty_like(order)
+                self._ranks[order] = np.arange(len(order))
+
+    def _rows(self):
+        """
+        Return the selected rows that are not deleted, in viewing order (recomputed after changes only).
+        """
+        if self._visible is None:
+            if self.order is None:
+                rows = np.flatnonzero(~self.deleted) if self.selection is None else self.selection
+            else:
+                rows = self.order
+                if self.selection is not None:
+                    rows = rows[np.isin(rows, self.selection)]
+            self._visible = rows[~self.deleted[rows]]
+        return self._visible
+
+    def select(self, rows):
+        """
+        Restrict the positions to the given sorted file rows (None for all rows).
+        """
+        self.selection = rows
+        self._visible = None
+
+    def __len__(self):
+        return len(self._rows())
+
+    def _page(self, number):
+        """
+        Return page number as a DataFrame, from the cache or read from the file.
+        """
+        return self._load(("page", number), lambda: self._read_rows(number * PAGE_SIZE, (number + 1) * PAGE_SIZE))
+
+    def _load(self, key, read):
+        """
+        Return the cached value for key, or call read() to produce it. Concurrent callers of the same
+        key wait for the first one rather than reading twice.
+        """
+        with self._lock:
+            cache = self._pages if key[0] == "page" else self._columns
+            if key in cache:
+                if cache is self._pages:
+                    cache.move_to_end(key)
+                return cache[key]
+            event = self._loading.get(key)
+            loader = event is None
+            if loader:
+                event = self._loading[key] = threading.Event()
+
+        if not loader:
+            event.wait()
+            return self._load(key, read)
+
+        try:
+            value = read()
+            with self._lock:
+                cache[key] = value
+                while len(self._pages) > CACHED_PAGES:
+                    self._pages.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                del self._loading[key]
+            event.set()
+
+    def row(self, index):
+        """
+        Return the file row of the job at the given position.
+        """
+        return int(self._rows()[index])
+
+    def __getitem__(self, index):
+        """
+        Return the job at the given position as a Series, and prefetch the neighbouring pages.
+        """
+        row = self.row(index)
+        number = row // PAGE_SIZE
+        job = self._page(number).iloc[row - number * PAGE_SIZE]
+        neighbours = (number - 1, number + 1)
+        if self.order is not None:
+            # Sorted, the adjacent jobs may be anywhere in the file.
+            rows = self._rows()
+            neighbours = {int(rows[i]) // PAGE_SIZE for i in (index - 1, index + 1) if 0 <= i < len(rows)} - {number}
+        for neighbour in neighbours:
+            if 0 <= neighbour * PAGE_SIZE < self._row_count():
+                self._prefetcher.submit(self._prefetch, self._page, neighbour)
+        return job
+
+    def _prefetch(self, load, *args):
+        try:
+            load(*args)
+        except Exception as e:
+            print(f"Error prefetching from {self.file_path}: {e}")
+
+    def column(self, name):
+        """
+        Return one column for every row of the file (deleted ones included) as a numpy array,
+        read once and cached. Missing columns are all None.
+        """
+        return self._load(("column", name), lambda: self._read_column(name))
+
+    def _read_column(self, name):
+        parts = [chunk[name] for chunk in self._scan_columns([name])]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=object)
+
+    def scan_columns(self, names, keep=()):
+        """
+        Yield the given columns for every row of the file (deleted ones included), _SCAN_ROWS rows at a time,
+        as dicts of name to numpy array, in one pass over the file. Missing columns are all None.
+        The columns in keep are cached for column() once the pass is over; the others are never held whole.
+        """
+        kept = {name: [] for name in keep}
+        for chunk in self._scan_columns(names):
+            for name, parts in kept.items():
+                parts.append(chunk[name])
+            yield chunk
+        with self._lock:
+            for name, parts in kept.items():
+                self._columns.setdefault(("column", name), np.concatenate(parts) if parts else np.empty(0, dtype=object))
+
+    @staticmethod
+    def _chunk_columns(frame, names):
+        return {
+            name: frame[name].to_numpy() if name in frame.columns else np.full(len(frame), None, dtype=object)
+            for name in names
+        }
+
+    def delete(self, index):
+        """
+        Flag the job at the given position as deleted and return its job_url.
+        """
+        job_url = self[index].get("job_url")
+        self.delete_rows([self.row(index)])
+        return job_url
+
+    def delete_rows(self, rows):
+        """
+        Flag the given file rows as deleted.
+        """
+        self.deleted[rows] = True
+        self._visible = None
+
+    def position(self, row):
+        """
+        Return the position of the given file row among the remaining rows (where it is or would be).
+        """
+        if self._ranks is None:
+            return int(np.searchsorted(self._rows(), row))
+        return int(np.searchsorted(self._ranks[self._rows()], self._ranks[row]))
+
+    def close(self):
+        self._prefetcher.shutdown(wait=False, cancel_futures=True)
+
+
+class CsvJobSource(_PagedJobSource):
+    """
+    Lazy source over a CSV jobs file. An index of the byte offset of every row, and of its SORT_COLUMN value,
+    is built once by a vectorized scan of the memory-mapped file and cached next to it (file + ".idx.npz");
+    when the file was only appended to since, just the new rows are scanned. A page is parsed by pandas
+    from its byte range.
+    The cached index is only reused for the same file (inode), with the same bytes at both ends of the indexed
+    region and a newline before every indexed row, so rewrites of the same size are indexed again.
+    """
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self._file = open(file_path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(file_path) else b""
+        self.offsets, self._scores = self._load_index()
+        self.header = bytes(self._data[:self.offsets[0]]) if len(self.offsets) else b""
+        self._init_rows()
+
+    def _index_path(self):
+        return self.file_path + ".idx.npz"
+
+    def _load_index(self):
+        """
+        Return the offsets of the header end and of every row end, and the SORT_COLUMN value of every row,
+        from the cached index if still valid.
+        """
+        size = len(self._data)
+        offsets, scores, quoted, start = np.empty(0, dtype=np.int64), np.empty(0), 0, 0
+        inode = os.fstat(self._file.fileno()).st_ino
+        try:
+            cached = np.load(self._index_path())
+            indexed = int(cached["size"])
+            head, tail = cached["head"].tobytes(), cached["tail"].tobytes()
+            if (
+                int(cached["inode"]) == inode
+                and indexed <= size
+                and bytes(self._data[:len(head)]) == head
+                and bytes(self._data[max(0, indexed - len(tail)):indexed]) == tail
+                and self._rows_start_at(cached["offsets"])
+            ):
+                offsets, scores, quoted, start = cached["offsets"], cached["scores"], int(cached["quoted"]), indexed
+        except (OSError, KeyError, ValueError):
+            pass
+
+        if start < size:
+            new_offsets, quoted = _row_offsets(self._data, start, size, quoted)
+            offsets = np.concatenate([offsets, new_offsets])
+            scores = np.concatenate([scores, self._scan_scores(offsets, len(scores))])
+            head = np.frombuffer(bytes(self._data[:min(size, _TAIL_BYTES)]), dtype=np.uint8)
+            tail = np.frombuffer(bytes(self._data[max(0, size - _TAIL_BYTES):size]), dtype=np.uint8)
+            try:
+                np.savez(self._index_path(), offsets=offsets, scores=scores, quoted=quoted, size=size, inode=inode,
+                         head=head, tail=tail)
+            except OSError as e:
+                print(f"Error caching the row index of {self.file_path}: {e}")
+            print(f"Indexed {self.file_path}: {max(len(offsets) - 1, 0)} jobs ({size - start} bytes scanned).")
+        return offsets, scores
+
+    def _rows_start_at(self, offsets):
+        """
+        Return whether a newline precedes every one of the given offsets, as it does every row start.
+        """
+        if not len(offsets):
+            return True
+        data = np.frombuffer(self._data, dtype=np.uint8)
+        return offsets[-1] <= len(data) and bool((data[offsets - 1] == ord("\n")).all())
+
+    def _scan_scores(self, offsets, first):
+        """
+        Return the SORT_COLUMN value of the rows from first on (NaN if the file has no such column).
+        """
+        rows = len(offsets) - 1 - first
+        if rows <= 0:
+            return np.empty(0)
+        header = bytes(self._data[:offsets[0]])
+        if SORT_COLUMN not in pd.read_csv(io.BytesIO(header), nrows=0).columns:
+            return np.full(rows, np.nan)
+        body = self._data[offsets[first]:offsets[-1]]
+        values = pd.read_csv(io.BytesIO(header + body), usecols=[SORT_COLUMN])[SORT_COLUMN]
+        return pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+
+    def _row_count(self):
+        return max(len(self.offsets) - 1, 0)
+
+    def _sort_values(self):
+        return self._scores
+
+    def _read_rows(self, start, stop):
+        stop = min(stop, self._row_count())
+        body = self._data[self.offsets[start]:self.offsets[stop]]
+        return pd.read_csv(io.BytesIO(self.header + body))
+
+    def _scan_columns(self, names):
+        if self._row_count() == 0:
+            return
+        available = [name for name in names if name in pd.read_csv(io.BytesIO(self.header), nrows=0).columns]
+        if not available:
+            yield self._chunk_columns(pd.DataFrame(index=range(self._row_count())), names)
+            return
+        # Read from the file rather than from a copy of the mapped bytes, and only the indexed rows.
+        chunks = pd.read_csv(self.file_path, usecols=available, nrows=self._row_count(), chunksize=_SCAN_ROWS)
+        for chunk in chunks:
+            yield self._chunk_columns(chunk, names)
+
+    def close(self):
+        super().close()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+
+class ParquetJobSource(_PagedJobSource):
+    """
+    Lazy source over a Parquet jobs dataset. The index is the row count of every row group,
+    read from the part footers; a page is read from the row groups that hold it.
+    """
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        pa = require_pyarrow()
+        self._groups = []
+        for part in part_paths(file_path):
+            metadata = pa.parquet.ParquetFile(part).metadata
+            for group in range(metadata.num_row_groups):
+                self._groups.append((part, group, metadata.row_group(group).num_rows))
+        self.offsets = np.concatenate([[0], np.cumsum([rows for _, _, rows in self._groups], dtype=np.int64)])
+        self._init_rows()
+
+    def _row_count(self):
+        return int(self.offsets[-1])
+
+    def _sort_values(self):
+        if self._row_count() == 0:
+            return np.empty(0)
+        return pd.to_numeric(pd.Series(self._read_column(SORT_COLUMN)), errors="coerce").to_numpy(dtype=float)
+
+    def _scan_columns(self, names):
+        pa = require_pyarrow()
+        for part, group, rows in self._groups:
+            parquet_file = pa.parquet.ParquetFile(part)
+            available = [name for name in names if name in parquet_file.schema_arrow.names]
+            if not available:
+                yield self._chunk_columns(pd.DataFrame(index=range(rows)), names)
+                continue
+            # Integers with nulls stay Python ints, as in read_parquet_jobs.
+            chunk = parquet_file.read_row_group(group, columns=available).to_pandas(integer_object_nulls=True)
+            yield self._chunk_columns(chunk, names)
+
+    def _read_rows(self, start, stop):
+        pa = require_pyarrow()
+        stop = min(stop, self._row_count())
+        first = np.searchsorted(self.offsets, start, side="right") - 1
+        last = np.searchsorted(self.offsets, stop, side="left")
+        frames = []
+        for part, group, _ in self._groups[first:last]:
+            frames.append(pa.parquet.ParquetFile(part).read_row_group(group).to_pandas())
+        jobs = pd.concat(frames, ignore_index=True)
+        skip = start - int(self.offsets[first])
+        return jobs.iloc[skip:skip + stop - start].reset_index(drop=True)
+
+
+def open_job_source(file_path):
+    """
+    Open a lazy job source over a jobs file (CSV or Parquet), or return None if it does not exist.
+    Pending deletions are applied first, so the source only has to index live jobs.
+    """
+    if not os.path.exists(file_path):
+        print(f"{file_path} not found.")
+        return None
+    if load_tombstones(file_path):
+        compact_jobs(file_path)
+    if is_parquet(file_path):
+        return ParquetJobSource(file_path)
+    return CsvJobSource(file_path)
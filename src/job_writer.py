@@ -0,0 +1,70 @@
+import atexit
+import queue
+import threading
+from src.triage import add_reviewed, add_tombstones
+from src.utils import compact_jobs
+
+
+class BackgroundJobWriter:
+    """
+    Persists the triage actions of the GUI (deletions and reviewed marks) on a background thread,
+    so that the Tk main thread never waits for the disk. Operations queued while a write is in progress
+    are coalesced into one append per file. close() flushes everything and compacts the jobs file.
+    The thread is a daemon, so it never keeps the process alive if the GUI exits without close();
+    the queued actions are still flushed at exit.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="job-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close, compact=False)
+
+    def delete(self, job_urls):
+        self._queue.put(("delete", list(job_urls)))
+
+    def mark_reviewed(self, job_urls):
+        self._queue.put(("reviewed", list(job_urls)))
+
+    def _run(self):
+        running = True
+        while running:
+            operations = [self._queue.get()]
+            while True:
+                try:
+                    operations.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            deleted = {}
+            reviewed = {}
+            for operation in operations:
+                if operation is None:
+                    running = False
+                    continue
+                kind, job_urls = operation
+                # Dicts rather than sets, to keep the order of the actions in the files.
+                (deleted if kind == "delete" else reviewed).update(dict.fromkeys(job_urls))
+
+            try:
+                if deleted:
+                    add_tombstones(self.file_path, deleted)
+                if reviewed:
+                    add_reviewed(self.file_path, reviewed)
+            except Exception as e:
+                print(f"Error saving triage actions to {self.file_path}: {e}")
+
+    def close(self, compact=True):
+        """
+        Write the pending operations, stop the thread and, with compact, apply the deletions to the jobs file.
+        Closing again only compacts.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+            atexit.unregister(self.close)
+        if compact:
+            compact_jobs(self.file_path)
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import pandas as pd
+from src.llm_cache import LLMDecisionCache
+
+
+def task_id(task):
+    """
+    Return a stable identifier of a scrape task, derived from what it scrapes.
+    """
+    payload = json.dumps([task.label, list(task.sites), task.params], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class RunJournal:
+    """
+    Records the progress of a run in a directory, so that an interrupted run can be resumed:
+      - which scrape tasks are done (their kept jobs saved and the seen history committed);
+      - the raw jobs of tasks that were scraped but not processed yet, as gzip-compressed pickles;
+      - every LLM decision made.
+    The journal is an append-only JSON-lines file next to the batch files. It also serves as an LLM
+    decision cache (same interface as LLMDecisionCache), in front of the persistent cache if there is one.
+    """
+
+    def __init__(self, directory, resume=False, cache=None):
+        self.directory = directory
+        self.cache = cache
+        self.done = set()
+        self.scraped = {}
+        self.decisions = {}
+        self._lock = threading.Lock()
+
+        journal_path = os.path.join(directory, "journal.jsonl")
+        if os.path.exists(journal_path):
+            if resume:
+                self._load(journal_path)
+                print(f"Resuming run: {len(self.done)} tasks done, {len(self.scraped)} scraped batches "
+                      f"and {len(self.decisions)} LLM decisions recovered from {directory}.")
+            else:
+                print(f"Discarding the journal of an unfinished run in {directory} (use --resume to continue it).")
+                shutil.rmtree(directory)
+
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(journal_path, "a")
+
+    def _load(self, journal_path):
+        with open(journal_path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by the interruption.
+                    continue
+                if entry["event"] == "done":
+                    self.done.add(entry["task"])
+                    self.scraped.pop(entry["task"], None)
+                elif entry["event"] == "scraped":
+                    self.scraped[entry["task"]] = entry["file"]
+                elif entry["event"] == "llm":
+                    self.decisions[entry["key"]] = entry["keep_job"]
+
+    def _write(self, entry):
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+
+    def is_done(self, task):
+        return task_id(task) in self.done
+
+    def load_batch(self, task):
+        """
+        Return the jobs recorded for a task that was scraped before the interruption, or None.
+        """
+        file_name = self.scraped.get(task_id(task))
+        if file_name is None:
+            return None
+        try:
+            return pd.read_pickle(os.path.join(self.directory, file_name), compression="gzip")
+        except Exception as e:
+            print(f"Error loading journaled batch {file_name}, scraping again: {e}")
+            return None
+
+    def record_scraped(self, task, jobs):
+        identifier = task_id(task)
+        file_name = f"batch_{identifier}.pkl.gz"
+        tmp_path = os.path.join(self.directory, file_name + ".tmp")
+        jobs.to_pickle(tmp_path, compression="gzip")
+        os.replace(tmp_path, os.path.join(self.directory, file_name))
+        self._write({"event": "scraped", "task": identifier, "file": file_name})
+
+    def record_done(self, task):
+        identifier = task_id(task)
+        self._write({"event": "done", "task": identifier})
+        file_name = self.scraped.pop(identifier, None) or f"batch_{identifier}.pkl.gz"
+        path = os.path.join(self.directory, file_name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    # LLM decision cache interface.
+
+    key = staticmethod(LLMDecisionCache.key)
+
+    def get_many(self, keys):
+        found = {key: self.decisions[key] for key in keys if key in self.decisions}
+        if self.cache is not None:
+            found.update(self.cache.get_many([key for key in keys if key not in found]))
+        return found
+
+    def put_many(self, decisions):
+        for key, keep_job in decisions.items():
+            self.decisions[key] = keep_job
+            self._write({"event": "llm", "key": key, "keep_job": keep_job})
+        if self.cache is not None:
+            self.cache.put_many(decisions)
+
+    def finish(self):
+        """
+        Delete the journal after a run completed.
+        """
+        self._file.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def close(self):
+        """
+        Close the journal but keep it on disk, for --resume.
+        """
+        if not self._file.closed:
+            self._file.close()
@@ -0,0 +1,121 @@
+import hashlib
+import re
+import sqlite3
+import time
+
+# SQLite limits the number of host parameters per statement; stay well below it.
+_SQLITE_CHUNK = 500
+
+
+def normalize_description(description):
+    """
+    Normalize a job description for cache keys: lowercased, with all whitespace runs collapsed,
+    so that postings differing only in formatting share a key.
+    """
+    return re.sub(r"\s+", " ", str(description or "")).strip().lower()
+
+
+class LLMDecisionCache:
+    """
+    Persistent cache of LLM keep/filter decisions in a SQLite file, keyed on a hash of
+    (model, system prompt, title, location, normalized description). Changing the model or
+    the prompt changes every key, so stale decisions are never reused; they age out through
+    eviction. Entries older than max_age_days, and the least recently used entries beyond
+    max_entries, are evicted when the cache is closed.
+    """
+
+    def __init__(self, file_path, max_entries=100_000, max_age_days=30):
+        self.file_path = file_path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(file_path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS decisions (
+                key TEXT PRIMARY KEY,
+                keep_job INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+
+    @staticmethod
+    def key(model, system_prompt, title, location, description):
+        """
+        Return the cache key of a decision.
+        """
+        parts = [
+            str(model),
+            str(system_prompt),
+            str(title or "").strip().lower(),
+            str(location or "").strip().lower(),
+            normalize_description(description),
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def get_many(self, keys):
+        """
+        Return a dict mapping each of the given keys that is cached to its decision,
+        and count hits and misses.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        for start in range(0, len(keys), _SQLITE_CHUNK):
+            chunk = keys[start:start + _SQLITE_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key, keep_job FROM decisions WHERE key IN ({placeholders})", chunk
+            )
+            found.update((key, bool(keep_job)) for key, keep_job in rows)
+
+        now = time.time()
+        self.conn.executemany("UPDATE decisions SET last_used = ? WHERE key = ?", ((now, k) for k in found))
+        self.conn.commit()
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, decisions):
+        """
+        Store the given {key: keep_job} decisions.
+        """
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO decisions (key, keep_job, created, last_used) VALUES (?, ?, ?, ?)",
+            ((key, int(keep_job), now, now) for key, keep_job in decisions.items())
+        )
+        self.conn.commit()
+
+    def evict(self):
+        """
+        Delete entries older than max_age_days, then the least recently used entries beyond max_entries.
+        """
+        if self.max_age_days:
+            cutoff = time.time() - self.max_age_days * 86400
+            self.conn.execute("DELETE FROM decisions WHERE created < ?", (cutoff,))
+        if self.max_entries:
+            self.conn.execute(
+                """
+                DELETE FROM decisions WHERE key IN (
+                    SELECT key FROM decisions ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+        self.conn.commit()
+
+    def report(self):
+        """
+        Print the hit/miss counters of this run.
+        """
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0.0
+        print(f"[LLM CACHE] {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate).")
+
+    def close(self):
+        self.evict()
+        self.conn.close()
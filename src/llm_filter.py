@@ -0,0 +1,251 @@
+import asyncio
+import random
+import time
+import openai
+import pandas as pd
+from pydantic import BaseModel
+from src.adapters import (
+    LLM_MODEL,
+    JobFilterResponse,
+    format_job_info,
+    llm_system_prompt
+)
+
+
+class JobDecision(BaseModel):
+    job_id: int
+    keep_job: bool
+
+
+class JobBatchFilterResponse(BaseModel):
+    decisions: list[JobDecision]
+
+
+def _retry_after(error):
+    """
+    Return the delay in seconds requested by the server's Retry-After header, if any.
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMBudget:
+    """
+    Limit on the LLM requests of a run: at most max_jobs jobs sent to the LLM, and at most max_cost dollars
+    of estimated cost, counting about 4 characters per token of the prompt and the job at cost_per_million_tokens.
+    Either limit may be None. Cached decisions are free.
+    """
+
+    def __init__(self, max_jobs=None, max_cost=None, cost_per_million_tokens=0.15):
+        self.max_jobs = max_jobs
+        self.max_cost = max_cost
+        self.cost_per_million_tokens = cost_per_million_tokens
+        self.jobs = 0
+        self.cost = 0.0
+        self.skipped = 0
+
+    def estimate(self, system_prompt, job_info):
+        return (len(system_prompt) + len(job_info)) / 4 / 1e6 * self.cost_per_million_tokens
+
+    def take(self, system_prompt, job_infos):
+        """
+        Spend the budget on the given jobs in order (best first), and return how many of them fit.
+        """
+        taken = 0
+        for job_info in job_infos:
+            cost = self.estimate(system_prompt, job_info)
+            if self.max_jobs is not None and self.jobs >= self.max_jobs:
+                break
+            if self.max_cost is not None and self.cost + cost > self.max_cost:
+                break
+            self.jobs += 1
+            self.cost += cost
+            taken += 1
+        self.skipped += len(job_infos) - taken
+        return taken
+
+
+class AsyncLLMFilter:
+    """
+    Runs LLM keep/filter decisions for a DataFrame of jobs with up to max_concurrency
+    requests in flight over one shared client. Failed requests are retried with exponential
+    backoff (or the server's Retry-After delay when rate limited); if all retries fail,
+    the jobs are kept. With batch_size > 1, several jobs are packed into one structured-output request.
+    If a cache (see src.llm_cache) is given, cached decisions are reused and only misses hit the API.
+    What the LLM sees is customized in src.adapters (format_job_info, llm_system_prompt and LLM_MODEL).
+    With a budget (see LLMBudget), only the misses that fit in it are sent; the others get no decision.
+    """
+
+    def __init__(
+            self,
+            api_key,
+            prompt,
+            model=LLM_MODEL,
+            base_url=None,
+            max_concurrency=8,
+            batch_size=1,
+            max_retries=5,
+            base_delay=1.0,
+            max_delay=60.0,
+            cache=None,
+            metrics=None,
+            budget=None
+    ):
+        self.api_key = api_key
+        self.prompt = prompt
+        self.model = model
+        self.base_url = base_url
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.batch_size = max(1, int(batch_size))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.cache = cache
+        self.metrics = metrics
+        self.budget = budget
+
+    def filter(self, jobs_df):
+        """
+        Return a boolean Series aligned to jobs_df's index: True for jobs that should be kept.
+        Jobs without a decision (failed requests, or past the budget) are kept.
+        """
+        return self.decide(jobs_df).ne(False)
+
+    def decide(self, jobs_df):
+        """
+        Return a Series aligned to jobs_df's index of True (keep), False (filter out) or None for jobs
+        without a decision: their requests failed, or they did not fit in the budget. Jobs are sent in
+        order, so with a budget the first ones (the best, once ranked) are decided first.
+        """
+        if jobs_df.empty:
+            return pd.Series(dtype=object, index=jobs_df.index)
+
+        titles = self._column(jobs_df, "title")
+        locations = self._column(jobs_df, "location")
+        descriptions = self._column(jobs_df, "description")
+        job_infos = [format_job_info(*job) for job in zip(titles, locations, descriptions)]
+
+        decisions = [None] * len(job_infos)
+        keys = [None] * len(job_infos)
+        if self.cache is not None:
+            system_prompt = llm_system_prompt(self.prompt)
+            keys = [
+                self.cache.key(self.model, system_prompt, *job)
+                for job in zip(titles, locations, descriptions)
+            ]
+            cached = self.cache.get_many(keys)
+            decisions = [cached.get(key) for key in keys]
+
+        pending = [i for i, decision in enumerate(decisions) if decision is None]
+        if pending and self.budget is not None:
+            taken = self.budget.take(llm_system_prompt(self.prompt), [job_infos[i] for i in pending])
+            if taken < len(pending):
+                print(f"[LLM] Budget spent: {len(pending) - taken} job(s) left without a decision.")
+            pending = pending[:taken]
+        if pending:
+            results = asyncio.run(self._decide_all([job_infos[i] for i in pending], [keys[i] for i in pending]))
+            for i, decision in zip(pending, results):
+                decisions[i] = decision
+
+        return pd.Series(decisions, index=jobs_df.index, dtype=object)
+
+    async def _decide_all(self, job_infos, keys):
+        """
+        Return one decision per job info, or None for jobs whose requests failed.
+        """
+        batches = [
+            (job_infos[start:start + self.batch_size], keys[start:start + self.batch_size])
+            for start in range(0, len(job_infos), self.batch_size)
+        ]
+
+        # The client owns the connection pool; our own retry loop replaces the SDK's.
+        async with openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0) as client:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            results = await asyncio.gather(
+                *(self._decide_batch(client, semaphore, batch, batch_keys) for batch, batch_keys in batches)
+            )
+
+        return [decision for batch_decisions in results for decision in batch_decisions]
+
+    @staticmethod
+    def _column(jobs_df, field):
+        if field not in jobs_df.columns:
+            return [""] * len(jobs_df)
+        return jobs_df[field].astype(object).fillna("").tolist()
+
+    async def _decide_batch(self, client, semaphore, batch, keys):
+        """
+        Return one keep/filter decision per job in batch, retrying with backoff on errors.
+        If all retries fail, the decisions are None.
+        Decisions are cached as soon as they arrive, so a crash later in the run does not lose them.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    if len(batch) == 1:
+                        decisions = [await self._request_single(client, batch[0])]
+                    else:
+                        decisions = await self._request_batch(client, batch)
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(f"[LLM] Retries exhausted ({e}). Defaulting to keeping {len(batch)} job(s).")
+                    return [None] * len(batch)
+
+                delay = _retry_after(e) if isinstance(e, openai.RateLimitError) else None
+                if delay is None:
+                    delay = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.5)
+                print(f"[LLM] Retry {attempt + 1} in {delay:.1f}s due to error: {e}")
+                if self.metrics is not None:
+                    self.metrics.record_retry("llm")
+                await asyncio.sleep(delay)
+
+        if self.cache is not None:
+            # Only real decisions are cached, never the keep-on-failure default.
+            self.cache.put_many({key: d for key, d in zip(keys, decisions) if d is not None})
+        return decisions
+
+    async def _parse(self, client, **kwargs):
+        """
+        Make one structured-output request, recording its latency and token usage.
+        """
+        start = time.perf_counter()
+        completion = await client.beta.chat.completions.parse(model=self.model, **kwargs)
+        if self.metrics is not None:
+            self.metrics.record_llm(time.perf_counter() - start, completion.usage)
+        return completion
+
+    async def _request_single(self, client, job_info):
+        completion = await self._parse(
+            client,
+            messages=[{"role": "system", "content": llm_system_prompt(self.prompt)},
+                      {"role": "user", "content": job_info}],
+            response_format=JobFilterResponse,
+        )
+        return completion.choices[0].message.parsed.keep_job
+
+    async def _request_batch(self, client, batch):
+        system_prompt = (
+            llm_system_prompt(self.prompt)
+            + " You will be given several jobs, each introduced by its job_id."
+            " Return one decision for every job_id."
+        )
+        user_content = "\n".join(f"job_id: {i}\n{job_info}" for i, job_info in enumerate(batch))
+        completion = await self._parse(
+            client,
+            messages=[{"role": "system", "content": system_prompt},
+                      {"role": "user", "content": user_content}],
+            response_format=JobBatchFilterResponse,
+        )
+
+        # Jobs the model did not return a decision for are kept, but not cached.
+        decisions = [None] * len(batch)
+        for decision in completion.choices[0].message.parsed.decisions:
+            if 0 <= decision.job_id < len(batch):
+                decisions[decision.job_id] = decision.keep_job
+        return decisions
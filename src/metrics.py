@@ -0,0 +1,190 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+
+
+def _percentile(values, q):
+    """
+    Return the q-th percentile (0-100) of values by linear interpolation, or None if values is empty.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class RunMetrics:
+    """
+    Collects timings and counts for one run: per pipeline stage (wall time, rows in and out, peak bytes
+    held), per scraped site group (wall time, calls, rows, errors), retries per component, and LLM
+    request latencies and token usage. Thread-safe, since scraping runs on a thread pool.
+    """
+
+    def __init__(self):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.stages = defaultdict(lambda: {"calls": 0, "seconds": 0.0, "rows_in": 0, "rows_out": 0, "peak_bytes": 0})
+        self.sites = defaultdict(lambda: {"tasks": 0, "errors": 0, "calls": 0, "seconds": 0.0, "rows": 0})
+        self.retries = defaultdict(int)
+        self.llm_latencies = []
+        self.llm_tokens = {"prompt_tokens": 0, "completion_tokens": 0}
+
+    def record_stage(self, name, seconds, rows_in, rows_out, bytes_held=0):
+        with self._lock:
+            stage = self.stages[name]
+            stage["calls"] += 1
+            stage["seconds"] += seconds
+            stage["rows_in"] += rows_in
+            stage["rows_out"] += rows_out
+            stage["peak_bytes"] = max(stage["peak_bytes"], int(bytes_held))
+
+    def record_site(self, sites, seconds, rows, ok, calls=1):
+        with self._lock:
+            site = self.sites["+".join(sites)]
+            site["tasks"] += 1
+            site["errors"] += 0 if ok else 1
+            site["calls"] += calls
+            site["seconds"] += seconds
+            site["rows"] += rows
+
+    def record_retry(self, component):
+        with self._lock:
+            self.retries[component] += 1
+
+    def record_llm(self, seconds, usage=None):
+        with self._lock:
+            self.llm_latencies.append(seconds)
+            if usage is not None:
+                self.llm_tokens["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+                self.llm_tokens["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+
+    def events(self):
+        """
+        Return the run's metrics as a list of JSON-serializable records.
+        """
+        base = {"run_id": self.run_id, "timestamp": self.started}
+        with self._lock:
+            events = [{**base, "type": "stage", "name": name, **stats} for name, stats in self.stages.items()]
+            events += [{**base, "type": "site", "name": name, **stats} for name, stats in self.sites.items()]
+            events.append({
+                **base,
+                "type": "llm",
+                "requests": len(self.llm_latencies),
+                "latency_p50": _percentile(self.llm_latencies, 50),
+                "latency_p90": _percentile(self.llm_latencies, 90),
+                "latency_p99": _percentile(self.llm_latencies, 99),
+                **self.llm_tokens,
+            })
+            events.append({
+                **base,
+                "type": "run",
+                "seconds": time.time() - self.started,
+                "retries": dict(self.retries),
+            })
+        return events
+
+    def write_report(self, file_path):
+        """
+        Append the run's metrics to a JSON-lines report file.
+        """
+        with open(file_path, "a") as f:
+            for event in self.events():
+                f.write(json.dumps(event) + "\n")
+        print(f"Wrote run report to {file_path}.")
+
+    def write_prometheus(self, file_path):
+        """
+        Write the run's metrics in the Prometheus textfile-collector format.
+        """
+        lines = []
+
+        def metric(name, help_text, samples):
+            lines.append(f"# HELP job_scraper_{name} {help_text}")
+            lines.append(f"# TYPE job_scraper_{name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"job_scraper_{name}{{{label_text}}} {value if value is not None else 'NaN'}")
+
+        with self._lock:
+            stages = dict(self.stages)
+            sites = dict(self.sites)
+            retries = dict(self.retries)
+            latencies = list(self.llm_latencies)
+            tokens = dict(self.llm_tokens)
+
+        metric("stage_seconds", "Wall time spent in a pipeline stage.",
+               [({"stage": n}, s["seconds"]) for n, s in stages.items()])
+        metric("stage_rows_in", "Rows entering a pipeline stage.",
+               [({"stage": n}, s["rows_in"]) for n, s in stages.items()])
+        metric("stage_rows_out", "Rows leaving a pipeline stage.",
+               [({"stage": n}, s["rows_out"]) for n, s in stages.items()])
+        metric("site_seconds", "Wall time spent scraping a site group.",
+               [({"site": n}, s["seconds"]) for n, s in sites.items()])
+        metric("site_rows", "Jobs scraped from a site group.",
+               [({"site": n}, s["rows"]) for n, s in sites.items()])
+        metric("site_errors", "Failed scrape tasks for a site group.",
+               [({"site": n}, s["errors"]) for n, s in sites.items()])
+        metric("retries", "Retries per component.", [({"component": n}, v) for n, v in retries.items()])
+        metric("llm_latency_seconds", "LLM request latency percentiles.",
+               [({"quantile": str(q / 100)}, _percentile(latencies, q)) for q in (50, 90, 99)])
+        metric("llm_tokens", "LLM tokens used.", [({"kind": k}, v) for k, v in tokens.items()])
+        metric("run_seconds", "Wall time of the run.", [({}, time.time() - self.started)])
+
+        tmp_path = file_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, file_path)
+
+    def print_summary(self):
+        print(f"[METRICS] Run {self.run_id} took {time.time() - self.started:.1f}s.")
+        with self._lock:
+            for name, s in self.sites.items():
+                print(f"[METRICS] site {name}: {s['tasks']} tasks, {s['calls']} calls, {s['rows']} jobs, "
+                      f"{s['errors']} errors, {s['seconds']:.1f}s")
+            for name, s in self.stages.items():
+                print(f"[METRICS] stage {name}: {s['rows_in']} -> {s['rows_out']} jobs, {s['seconds']:.2f}s, "
+                      f"peak {s['peak_bytes'] / 1e6:.1f} MB")
+            if self.llm_latencies:
+                print(f"[METRICS] LLM: {len(self.llm_latencies)} requests, "
+                      f"p50 {_percentile(self.llm_latencies, 50):.2f}s, p99 {_percentile(self.llm_latencies, 99):.2f}s, "
+                      f"{self.llm_tokens['prompt_tokens']} prompt / {self.llm_tokens['completion_tokens']} completion tokens")
+            if self.retries:
+                print(f"[METRICS] retries: {dict(self.retries)}")
+
+
+def run_profiled(fn, *args, output_file="profile.out", top=25, **kwargs):
+    """
+    Run fn under cProfile and tracemalloc, print the hottest functions and the largest allocation
+    sites, and save the raw profile to output_file (readable with pstats or snakeviz).
+    """
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        profiler.dump_stats(output_file)
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(top)
+        print(stream.getvalue())
+
+        print(f"[PROFILE] Peak traced memory: {peak / 1e6:.1f} MB. Top allocation sites:")
+        for stat in snapshot.statistics("lineno")[:10]:
+            print(f"[PROFILE]   {stat}")
+        print(f"[PROFILE] Saved the full profile to {output_file}.")
@@ -0,0 +1,220 @@
+import hashlib
+import re
+import sqlite3
+import zlib
+import numpy as np
+import pandas as pd
+
+# Mersenne prime used for the MinHash permutations; shingle hashes are 32-bit so a * x + b fits in 64 bits.
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+# SQLite limits the number of host parameters per statement; stay well below it.
+_SQLITE_CHUNK = 500
+
+
+def _tokens(text):
+    return re.findall(r"\w+", str(text or "").lower())
+
+
+def _containment(a, b):
+    """
+    Return |a & b| / min(|a|, |b|) for two token sets, or 1.0 if either is empty (no evidence against).
+    """
+    if not a or not b:
+        return 1.0
+    return len(a & b) / min(len(a), len(b))
+
+
+class NearDuplicateIndex:
+    """
+    Detects near-duplicate postings (the same job syndicated on several boards with slightly different
+    titles or locations) with MinHash signatures over word shingles of the description, indexed by
+    locality-sensitive hashing: each signature is split into bands, and only jobs sharing a band bucket
+    are compared, so a lookup touches a handful of rows no matter how large the history is.
+    A candidate is a near duplicate if its estimated description similarity reaches threshold and its
+    normalized title and company tokens overlap enough. Jobs without a description are signed on their
+    title and company instead.
+
+    The index is a SQLite file kept next to the seen history.
+    """
+
+    def __init__(self, file_path, threshold=0.8, num_perm=64, bands=16, shingle_size=3, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+        self.file_path = file_path
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self.conn = sqlite3.connect(file_path)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS signatures (
+                id INTEGER PRIMARY KEY,
+                job_url TEXT,
+                title_tokens TEXT,
+                company_tokens TEXT,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                signature_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS buckets_band_bucket ON buckets (band, bucket);
+            """
+        )
+
+    def signature(self, text):
+        """
+        Return the MinHash signature (num_perm uint32 values) of the word shingles of text.
+        """
+        tokens = _tokens(text)
+        k = min(self.shingle_size, len(tokens)) or 1
+        shingles = {" ".join(tokens[i:i + k]) for i in range(max(1, len(tokens) - k + 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64)
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return (permuted.min(axis=1) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        """
+        Return one signed 64-bit bucket key per band of the signature.
+        """
+        return [
+            int.from_bytes(
+                hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8).digest(),
+                "little",
+                signed=True
+            )
+            for band in range(self.bands)
+        ]
+
+    def _describe(self, jobs):
+        """
+        Return (signature, band keys, title tokens, company tokens) for every job.
+        """
+        entries = []
+        for job in jobs.reindex(columns=["title", "company", "description"]).itertuples(index=False):
+            title, company, description = (value if pd.notna(value) else "" for value in job)
+            text = description if str(description).strip() else f"{title} {company}"
+            signature = self.signature(text)
+            entries.append((signature, self._band_keys(signature), set(_tokens(title)), set(_tokens(company))))
+        return entries
+
+    def _candidates(self, entries):
+        """
+        Return {signature_id: (signature, title tokens, company tokens)} for every stored job that
+        shares a band bucket with any of the given entries.
+        """
+        wanted = {(band, key) for entry in entries for band, key in enumerate(entry[1])}
+        by_band = {}
+        for band, key in wanted:
+            by_band.setdefault(band, []).append(key)
+
+        ids = set()
+        for band, keys in by_band.items():
+            for start in range(0, len(keys), _SQLITE_CHUNK):
+                chunk = keys[start:start + _SQLITE_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT signature_id FROM buckets WHERE band = ? AND bucket IN ({placeholders})",
+                    [band, *chunk]
+                )
+                ids.update(row[0] for row in rows)
+
+        candidates = {}
+        ids = list(ids)
+        for start in range(0, len(ids), _SQLITE_CHUNK):
+            chunk = ids[start:start + _SQLITE_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT id, signature, title_tokens, company_tokens FROM signatures WHERE id IN ({placeholders})",
+                chunk
+            )
+            for signature_id, signature, title_tokens, company_tokens in rows:
+                candidates[signature_id] = (
+                    np.frombuffer(signature, dtype=np.uint32),
+                    set(title_tokens.split()),
+                    set(company_tokens.split()),
+                )
+        return candidates
+
+    def _is_match(self, entry, candidate):
+        signature, _, title_tokens, company_tokens = entry
+        other_signature, other_title_tokens, other_company_tokens = candidate
+        return (
+            np.mean(signature == other_signature) >= self.threshold
+            and _containment(title_tokens, other_title_tokens) >= 0.5
+            and _containment(company_tokens, other_company_tokens) >= 0.5
+        )
+
+    def find_duplicates(self, jobs):
+        """
+        Return a boolean Series aligned to jobs, True for jobs that are near duplicates of a job in the index
+        or of an earlier job in the same DataFrame. Jobs that are not duplicates are added to the index
+        (persisted on commit()).
+        """
+        if jobs.empty:
+            return pd.Series(False, index=jobs.index)
+
+        entries = self._describe(jobs)
+        stored = self._candidates(entries)
+        stored_buckets = {}
+        for signature_id, candidate in stored.items():
+            for band, key in enumerate(self._band_keys(candidate[0])):
+                stored_buckets.setdefault((band, key), []).append(candidate)
+
+        job_urls = jobs["job_url"].tolist() if "job_url" in jobs.columns else [None] * len(jobs)
+        duplicates = []
+        for entry, job_url in zip(entries, job_urls):
+            candidates = [c for band, key in enumerate(entry[1]) for c in stored_buckets.get((band, key), [])]
+            is_duplicate = any(self._is_match(entry, candidate) for candidate in candidates)
+            duplicates.append(is_duplicate)
+            if not is_duplicate:
+                self._add(entry, job_url)
+                # Later jobs in this batch are compared against this one as well.
+                for band, key in enumerate(entry[1]):
+                    stored_buckets.setdefault((band, key), []).append((entry[0], entry[2], entry[3]))
+
+        return pd.Series(duplicates, index=jobs.index)
+
+    def _add(self, entry, job_url):
+        signature, band_keys, title_tokens, company_tokens = entry
+        cursor = self.conn.execute(
+            "INSERT INTO signatures (job_url, title_tokens, company_tokens, signature) VALUES (?, ?, ?, ?)",
+            (job_url if pd.notna(job_url) else None, " ".join(sorted(title_tokens)),
+             " ".join(sorted(company_tokens)), signature.tobytes())
+        )
+        self.conn.executemany(
+            "INSERT INTO buckets (band, bucket, signature_id) VALUES (?, ?, ?)",
+            ((band, key, cursor.lastrowid) for band, key in enumerate(band_keys))
+        )
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        """
+        Discard the signatures added since the last commit.
+        """
+        self.conn.rollback()
+
+    def close(self):
+        # Uncommitted signatures belong to batches that were never saved: they are dropped, not committed.
+        self.rollback()
+        self.conn.close()
+
+
+def filter_near_duplicates(jobs_df, index):
+    """
+    Return the jobs that are not near duplicates of already-seen jobs or of each other.
+    """
+    if jobs_df.empty:
+        return jobs_df
+    return jobs_df[~index.find_duplicates(jobs_df).to_numpy()]
@@ -0,0 +1,133 @@
+import os
+import shutil
+import time
+
+# A Parquet jobs file is a directory of zstd-compressed part files ("a dataset"): appending a batch
+# writes one new part, and reading concatenates the parts in the order they were written.
+PART_PREFIX = "part-"
+COMPRESSION = "zstd"
+# Row groups are kept small so that a few rows can be read without decoding a whole part.
+ROW_GROUP_SIZE = 1000
+# pandas is imported by the functions that need it, so that the path helpers stay cheap to import.
+
+
+def require_pyarrow():
+    """
+    Import pyarrow, which is only needed for the Parquet storage format.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise Exception('The "parquet" storage format needs pyarrow: pip install pyarrow')
+    return pyarrow
+
+
+def is_parquet(file_path):
+    return file_path.lower().endswith(".parquet")
+
+
+def part_paths(file_path):
+    if not os.path.isdir(file_path):
+        return []
+    names = sorted(name for name in os.listdir(file_path) if name.startswith(PART_PREFIX) and name.endswith(".parquet"))
+    return [os.path.join(file_path, name) for name in names]
+
+
+def _write_part(file_path, jobs):
+    """
+    Write jobs as a new part of the dataset at file_path. The part only appears once fully written.
+    """
+    import pandas as pd
+
+    pa = require_pyarrow()
+    os.makedirs(file_path, exist_ok=True)
+    # Mixed-type object columns (e.g. strings and floats) cannot be stored as one Arrow type.
+    jobs = jobs.reset_index(drop=True)
+    for column in jobs.columns:
+        if jobs[column].dtype == object:
+            values = jobs[column].dropna()
+            if not values.empty and values.map(type).nunique() > 1:
+                jobs[column] = jobs[column].map(lambda v: v if pd.isna(v) else str(v))
+    table = pa.Table.from_pandas(jobs, preserve_index=False)
+
+    name = f"{PART_PREFIX}{time.time_ns():020d}.parquet"
+    tmp_path = os.path.join(file_path, "." + name + ".tmp")
+    pa.parquet.write_table(table, tmp_path, compression=COMPRESSION, row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp_path, os.path.join(file_path, name))
+
+
+def read_parquet_jobs(file_path, columns=None):
+    """
+    Read the jobs stored in the Parquet dataset at file_path into a DataFrame.
+    With columns, only those columns are read from disk (columns missing from a part are filled with nulls).
+    """
+    import pandas as pd
+
+    pa = require_pyarrow()
+    tables = []
+    for part in part_paths(file_path):
+        if columns is not None:
+            available = set(pa.parquet.read_schema(part).names)
+            tables.append(pa.parquet.read_table(part, columns=[c for c in columns if c in available]))
+        else:
+            tables.append(pa.parquet.read_table(part))
+
+    if not tables:
+        return pd.DataFrame(columns=columns or [])
+    # Integers with nulls (e.g. from parts that lack the column) come back as Python ints rather than
+    # floats, which would round 64-bit hashes.
+    try:
+        jobs = pa.concat_tables(tables, promote_options="permissive").to_pandas(integer_object_nulls=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Parts whose types cannot be unified (e.g. dates migrated from CSV as strings): let pandas upcast.
+        jobs = pd.concat([table.to_pandas(integer_object_nulls=True) for table in tables], ignore_index=True)
+    if columns is not None:
+        jobs = jobs.reindex(columns=columns)
+    return jobs
+
+
+def append_parquet_jobs(file_path, jobs):
+    """
+    Append jobs to the Parquet dataset at file_path, creating it if needed.
+    Parts may have different columns; they are reconciled when reading.
+    """
+    _write_part(file_path, jobs)
+
+
+def rewrite_parquet_jobs(file_path, jobs):
+    """
+    Replace the Parquet dataset at file_path by a single part holding jobs.
+    """
+    tmp_path = file_path.rstrip(os.sep) + ".tmp"
+    old_path = file_path.rstrip(os.sep) + ".old"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    _write_part(tmp_path, jobs)
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(file_path):
+        os.replace(file_path, old_path)
+    os.replace(tmp_path, file_path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def migrate_csv_to_parquet(csv_path, parquet_path, columns=None, chunksize=100_000):
+    """
+    One-shot migration of a CSV jobs file into a Parquet dataset, chunk by chunk.
+    With columns, only those columns are kept. The CSV file is left in place.
+    Returns the number of jobs migrated.
+    """
+    import pandas as pd
+
+    # Build into a temporary dataset so that a failed migration is retried on the next run.
+    tmp_path = parquet_path.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+
+    usecols = (lambda c: c in columns) if columns is not None else None
+    count = 0
+    for chunk in pd.read_csv(csv_path, usecols=usecols, chunksize=chunksize):
+        _write_part(tmp_path, chunk)
+        count += len(chunk)
+    os.makedirs(tmp_path, exist_ok=True)
+    os.replace(tmp_path, parquet_path)
+    print(f"Migrated {csv_path} into {parquet_path} ({count} jobs).")
+    return count
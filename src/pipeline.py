@@ -0,0 +1,65 @@
+import time
+from src.seen_store import job_identity_keys
+
+
+class RunDeduplicator:
+    """
+    Pipeline stage that drops jobs already produced earlier in the same run (same job_url or
+    same (title, company, location) identity). Only the keys are remembered, not the jobs.
+    """
+
+    def __init__(self):
+        self.job_urls = set()
+        self.identities = set()
+
+    def __call__(self, jobs):
+        if jobs.empty:
+            return jobs
+
+        identities = job_identity_keys(jobs)
+        duplicate = (
+            jobs["job_url"].duplicated()
+            | identities.duplicated()
+            | jobs["job_url"].isin(self.job_urls)
+            | identities.isin(self.identities)
+        ).to_numpy()
+
+        self.job_urls.update(jobs["job_url"][~duplicate].dropna())
+        self.identities.update(identities[~duplicate])
+        return jobs[~duplicate]
+
+
+def stream_jobs(batches, stages, metrics=None):
+    """
+    Push each batch of scraped jobs through the stages, a list of (name, function) pairs where each
+    function takes and returns a jobs DataFrame, and yield what survives (possibly an empty DataFrame).
+    Batches are processed one at a time, so only the current batch is held in memory.
+    With metrics (see src.metrics), the time spent waiting for each batch and in each stage is recorded.
+    """
+    batches = iter(batches)
+    number = 0
+    while True:
+        start = time.perf_counter()
+        batch = next(batches, None)
+        if batch is None:
+            return
+        number += 1
+        if metrics is not None:
+            metrics.record_stage("scrape", time.perf_counter() - start, 0, len(batch))
+
+        if batch.empty:
+            yield batch
+            continue
+
+        print(f"[PIPELINE] Batch {number}: {len(batch)} scraped jobs.")
+        for name, stage in stages:
+            rows_in = len(batch)
+            bytes_held = batch.memory_usage(deep=True).sum() if metrics is not None else 0
+            start = time.perf_counter()
+            batch = stage(batch)
+            if metrics is not None:
+                metrics.record_stage(name, time.perf_counter() - start, rows_in, len(batch), bytes_held)
+            print(f"[PIPELINE] Batch {number}: after {name}, {len(batch)} jobs remain.")
+            if batch.empty:
+                break
+        yield batch
@@ -0,0 +1,200 @@
+import json
+import os
+import random
+import threading
+import time
+from src.config import load_proxies
+
+
+class TokenBucket:
+    """
+    Allows rate_per_minute acquisitions per minute on average, with bursts of up to burst.
+    """
+
+    def __init__(self, rate_per_minute, burst=1):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """
+        Return the number of seconds until a token is available (0 if one is available now).
+        """
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class ProxyStats:
+    """
+    Health of one proxy: moving averages of latency and error rate, and circuit-breaker state.
+    open_until is a wall-clock timestamp so that it survives restarts.
+    """
+
+    def __init__(self, latency=None, error_rate=0.0, failures=0, open_until=0.0, cooldown=0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.failures = failures
+        self.open_until = open_until
+        self.cooldown = cooldown
+
+    def weight(self):
+        """
+        Selection weight: proxies that fail less and answer faster are picked more often.
+        Proxies without measurements yet get a neutral latency so that they are tried.
+        """
+        latency = self.latency if self.latency is not None else 5.0
+        return max(0.05, 1.0 - self.error_rate) / max(0.1, latency)
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+class ProxyPool:
+    """
+    Hands out one proxy per scrape call, chosen at random weighted by health.
+      - Latency and error rate are tracked per proxy as exponential moving averages.
+      - After failure_threshold consecutive failures a proxy's circuit opens and it is skipped for a
+        cooldown that doubles on each further failed probe (up to max_cooldown); one success closes it again.
+      - Token buckets limit calls per proxy and per site.
+    Health is saved to state_file so that a restart does not have to rediscover bad proxies.
+    Thread-safe: acquire() blocks the calling thread until a proxy and the sites' rate limits allow a call.
+    """
+
+    def __init__(
+            self,
+            proxies,
+            state_file=None,
+            failure_threshold=3,
+            cooldown=300,
+            max_cooldown=3600,
+            proxy_rate_per_minute=None,
+            site_rate_per_minute=None,
+            smoothing=0.3
+    ):
+        self.proxies = list(dict.fromkeys(proxies))
+        self.state_file = state_file
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+
+        self.stats = {proxy: ProxyStats() for proxy in self.proxies}
+        self._load_state()
+
+        # The per-proxy limit spreads calls over real proxies; it does not apply to load_proxies'
+        # "localhost" placeholder (no proxy), which would otherwise throttle every call.
+        self._proxy_buckets = {
+            proxy: TokenBucket(proxy_rate_per_minute) for proxy in self.proxies if proxy != "localhost"
+        } if proxy_rate_per_minute else {}
+        self._site_buckets = {
+            site: TokenBucket(rate) for site, rate in (site_rate_per_minute or {}).items()
+        }
+
+    @classmethod
+    def from_file(cls, file_path, **kwargs):
+        """
+        Build a pool from a proxies file (see load_proxies).
+        """
+        return cls(load_proxies(file_path), **kwargs)
+
+    def _load_state(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, "r") as f:
+                state = json.load(f)
+        except Exception as e:
+            print(f"Error loading proxy state from {self.state_file}: {e}")
+            return
+
+        for proxy, stats in state.items():
+            if proxy in self.stats:
+                self.stats[proxy] = ProxyStats(**stats)
+        open_count = sum(1 for s in self.stats.values() if s.open_until > time.time())
+        print(f"Loaded proxy health for {len(state)} proxies ({open_count} currently circuit-broken).")
+
+    def save(self):
+        """
+        Persist proxy health to state_file.
+        """
+        if not self.state_file:
+            return
+        with self._lock:
+            state = {proxy: stats.to_dict() for proxy, stats in self.stats.items()}
+        tmp_path = self.state_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def _available(self, now_wall):
+        """
+        Return the proxies whose circuit is closed, or, if every circuit is open, the one that
+        re-opens soonest (so that it is probed rather than stopping the run).
+        """
+        closed = [p for p in self.proxies if self.stats[p].open_until <= now_wall]
+        if closed:
+            return closed
+        return [min(self.proxies, key=lambda p: self.stats[p].open_until)]
+
+    def acquire(self, sites=()):
+        """
+        Pick a proxy for a call to the given sites, waiting for the rate limits if needed.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                site_wait = max((self._site_buckets[s].wait_time(now) for s in sites if s in self._site_buckets),
+                                default=0.0)
+                candidates = self._available(time.time())
+                ready = [p for p in candidates if p not in self._proxy_buckets
+                         or self._proxy_buckets[p].wait_time(now) == 0]
+
+                if site_wait == 0 and ready:
+                    proxy = random.choices(ready, weights=[self.stats[p].weight() for p in ready])[0]
+                    if proxy in self._proxy_buckets:
+                        self._proxy_buckets[proxy].take(now)
+                    for site in sites:
+                        if site in self._site_buckets:
+                            self._site_buckets[site].take(now)
+                    return proxy
+
+                proxy_wait = min((self._proxy_buckets[p].wait_time(now) for p in candidates), default=0.0)
+                wait = max(site_wait, proxy_wait if not ready else 0.0)
+            time.sleep(max(wait, 0.01))
+
+    def report(self, proxy, success, latency=None):
+        """
+        Record the outcome of a call made through proxy.
+        """
+        with self._lock:
+            stats = self.stats.get(proxy)
+            if stats is None:
+                return
+
+            alpha = self.smoothing
+            stats.error_rate = (1 - alpha) * stats.error_rate + alpha * (0.0 if success else 1.0)
+            if latency is not None:
+                stats.latency = latency if stats.latency is None else (1 - alpha) * stats.latency + alpha * latency
+
+            if success:
+                stats.failures = 0
+                stats.cooldown = 0.0
+                stats.open_until = 0.0
+                return
+
+            stats.failures += 1
+            if stats.failures >= self.failure_threshold:
+                stats.cooldown = min(self.max_cooldown, stats.cooldown * 2 if stats.cooldown else self.cooldown)
+                stats.open_until = time.time() + stats.cooldown
+                print(f"Proxy {proxy.split('@')[-1]} failed {stats.failures} times in a row, "
+                      f"skipping it for {stats.cooldown:.0f}s.")
@@ -0,0 +1,137 @@
+import re
+import numpy as np
+import pandas as pd
+from src.rules import compile_terms
+from src.search_index import TOKEN_PATTERN
+
+# Fields scored with BM25, and how much a match in each counts.
+RANKED_FIELDS = {"title": 2.0, "description": 1.0}
+
+
+def _profile_terms(keywords):
+    """
+    Return {token: weight} for the profile keywords, a list of keywords (weight 1) or a {keyword: weight} dict.
+    Keywords of several words count each of their words.
+    """
+    if not isinstance(keywords, dict):
+        keywords = {keyword: 1.0 for keyword in keywords or []}
+    terms = {}
+    for keyword, weight in keywords.items():
+        for token in TOKEN_PATTERN.findall(str(keyword).lower()):
+            terms[token] = terms.get(token, 0.0) + float(weight)
+    return terms
+
+
+def _liked_terms(liked_jobs, top=50):
+    """
+    Return {token: weight} for the example liked jobs (dicts with a title and a description, or plain text):
+    the share of the examples that contain each token, for the top most shared tokens.
+    Common words get a share too, but BM25 gives them almost no weight.
+    """
+    if not liked_jobs:
+        return {}
+    counts = {}
+    for job in liked_jobs:
+        text = " ".join(str(job.get(field, "")) for field in RANKED_FIELDS) if isinstance(job, dict) else str(job)
+        for token in set(TOKEN_PATTERN.findall(text.lower())):
+            counts[token] = counts.get(token, 0) + 1
+    best = sorted(counts.items(), key=lambda item: -item[1])[:top]
+    return {token: count / len(liked_jobs) for token, count in best}
+
+
+class JobRanker:
+    """
+    Pipeline stage that scores jobs against a profile and sorts each batch best first, in a "score" column.
+    The score is the BM25 relevance of the title and description to the profile's keywords and to the words
+    shared by its example liked jobs, plus a bonus for preferred companies and locations.
+    Term frequencies are counted for the profile's vocabulary only, over a whole batch at once; document
+    frequencies and lengths accumulate over every batch the ranker has seen, so scores stay comparable
+    across batches and runs.
+    """
+
+    def __init__(self, keywords=None, liked_jobs=None, preferred_companies=None, preferred_locations=None,
+                 company_bonus=1.0, location_bonus=0.5, k1=1.2, b=0.75):
+        terms = _liked_terms(liked_jobs)
+        for token, weight in _profile_terms(keywords).items():
+            terms[token] = terms.get(token, 0.0) + weight
+
+        self.vocabulary = {token: i for i, token in enumerate(terms)}
+        # Whole tokens only, with the same token characters as TOKEN_PATTERN.
+        alternatives = "|".join(re.escape(token) for token in sorted(terms, key=len, reverse=True))
+        self._vocabulary_pattern = re.compile(rf"(?<![a-z0-9+#])(?:{alternatives})(?![a-z0-9+#])")
+        self.weights = np.array(list(terms.values()), dtype=float)
+        self.companies = compile_terms(preferred_companies, "word") if preferred_companies else None
+        self.locations = compile_terms(preferred_locations, "word") if preferred_locations else None
+        self.company_bonus = company_bonus
+        self.location_bonus = location_bonus
+        self.k1 = k1
+        self.b = b
+
+        self.document_count = 0
+        self.document_frequencies = {field: np.zeros(len(terms)) for field in RANKED_FIELDS}
+        self.total_lengths = {field: 0 for field in RANKED_FIELDS}
+
+    @classmethod
+    def from_profile(cls, profile):
+        """
+        Build a ranker from the "ranking_profile" of config.json.
+        """
+        return cls(
+            keywords=profile.get("keywords"),
+            liked_jobs=profile.get("liked_jobs"),
+            preferred_companies=profile.get("preferred_companies"),
+            preferred_locations=profile.get("preferred_locations"),
+            company_bonus=profile.get("company_bonus", 1.0),
+            location_bonus=profile.get("location_bonus", 0.5)
+        )
+
+    def _term_frequencies(self, values):
+        """
+        Return the (documents x vocabulary) term frequency matrix of values and the length of every document,
+        in characters (BM25 only compares lengths to the average, and counting tokens costs a regex pass).
+        """
+        values = values.astype(object).fillna("").astype(str).str.lower()
+        lengths = values.str.len().to_numpy(dtype=float)
+        # Only the profile's tokens are extracted, which is much cheaper than tokenizing everything.
+        matches = values.str.findall(self._vocabulary_pattern)
+        counts = matches.str.len().to_numpy()
+        term_ids = matches.explode().dropna().map(self.vocabulary).to_numpy(dtype=np.int64)
+        documents = np.repeat(np.arange(len(values)), counts)
+        size = len(self.vocabulary)
+        frequencies = np.bincount(documents * size + term_ids, minlength=len(values) * size)
+        return frequencies.reshape(len(values), size).astype(float), lengths
+
+    def score(self, jobs):
+        """
+        Return the score of every job, aligned to jobs' index, and add the jobs to the corpus statistics.
+        """
+        scores = np.zeros(len(jobs))
+        if self.vocabulary:
+            frequencies = {}
+            for field in RANKED_FIELDS:
+                values = jobs[field] if field in jobs.columns else pd.Series("", index=jobs.index)
+                frequencies[field] = self._term_frequencies(values)
+                self.document_frequencies[field] += (frequencies[field][0] > 0).sum(axis=0)
+                self.total_lengths[field] += frequencies[field][1].sum()
+            self.document_count += len(jobs)
+
+            for field, field_weight in RANKED_FIELDS.items():
+                tf, lengths = frequencies[field]
+                df = self.document_frequencies[field]
+                idf = np.log(1 + (self.document_count - df + 0.5) / (df + 0.5))
+                average_length = max(self.total_lengths[field] / self.document_count, 1.0)
+                norm = self.k1 * (1 - self.b + self.b * lengths / average_length)
+                saturated = tf * (self.k1 + 1) / (tf + norm[:, None])
+                scores += field_weight * (saturated @ (idf * self.weights))
+
+        for field, pattern, bonus in (("company", self.companies, self.company_bonus),
+                                      ("location", self.locations, self.location_bonus)):
+            if pattern is not None and field in jobs.columns:
+                scores += bonus * jobs[field].astype(object).fillna("").astype(str).str.contains(pattern).to_numpy()
+        return pd.Series(scores, index=jobs.index)
+
+    def __call__(self, jobs):
+        if jobs.empty:
+            return jobs
+        jobs = jobs.assign(score=self.score(jobs).round(4))
+        return jobs.sort_values("score", ascending=False, kind="stable")
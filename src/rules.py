@@ -0,0 +1,106 @@
+import re
+import pandas as pd
+
+MATCH_MODES = ("substring", "word", "regex")
+
+
+def compile_terms(terms, mode="word"):
+    """
+    Compile a list of terms into a single case-insensitive pattern that matches any of them.
+      - "substring": the term may appear anywhere, e.g. "intern" matches "internship".
+      - "word": the term must not be preceded or followed by a word character, e.g. "intern" does not match "internal".
+      - "regex": the terms are regular expressions.
+    Literal terms are tried longest first, so overlapping terms prefer the longer match.
+    """
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Unknown match mode '{mode}', expected one of {MATCH_MODES}.")
+
+    if mode == "regex":
+        alternatives = [f"(?:{term})" for term in terms]
+    else:
+        literals = sorted({term.strip().lower() for term in terms if term.strip()}, key=len, reverse=True)
+        alternatives = [re.escape(term) for term in literals]
+    pattern = "|".join(alternatives)
+    if mode == "word":
+        pattern = rf"(?<!\w)(?:{pattern})(?!\w)"
+    return re.compile(pattern, re.IGNORECASE)
+
+
+class FieldRule:
+    """
+    Keyword rules for one job field, evaluated over a whole DataFrame column at once:
+      - exclude: reject the job if the field matches any of these terms;
+      - include: reject the job unless the field matches at least one of these terms;
+      - weights: {term: weight}; reject the job if the sum of the weights of the matching terms is below min_score.
+    """
+
+    def __init__(self, field, include=None, exclude=None, weights=None, min_score=0, mode="word"):
+        self.field = field
+        self.mode = mode
+        self.include = compile_terms(include, mode) if include else None
+        self.exclude = compile_terms(exclude, mode) if exclude else None
+        self.weights = [(compile_terms([term], mode), weight) for term, weight in (weights or {}).items()]
+        self.min_score = min_score
+
+    def __repr__(self):
+        return f"FieldRule(field={self.field!r}, mode={self.mode!r})"
+
+    def score(self, jobs_df):
+        """
+        Return the weighted keyword score of every job, aligned to jobs_df's index.
+        """
+        values = jobs_df[self.field].astype(object).fillna("").astype(str)
+        score = pd.Series(0.0, index=jobs_df.index)
+        for pattern, weight in self.weights:
+            score += values.str.contains(pattern) * weight
+        return score
+
+    def keep_mask(self, jobs_df):
+        """
+        Return a boolean Series aligned to jobs_df's index: True for jobs this rule keeps.
+        If the field is missing, every job is kept.
+        """
+        keep = pd.Series(True, index=jobs_df.index)
+        if self.field not in jobs_df.columns:
+            return keep
+
+        values = jobs_df[self.field].astype(object).fillna("").astype(str)
+        if self.exclude is not None:
+            keep &= ~values.str.contains(self.exclude)
+        if self.include is not None:
+            keep &= values.str.contains(self.include)
+        if self.weights:
+            keep &= self.score(jobs_df) >= self.min_score
+        return keep
+
+
+def load_rules(rule_configs):
+    """
+    Build FieldRules from the "filter_rules" list of config.json.
+    """
+    return [
+        FieldRule(
+            rule["field"],
+            include=rule.get("include"),
+            exclude=rule.get("exclude"),
+            weights=rule.get("weights"),
+            min_score=rule.get("min_score", 0),
+            mode=rule.get("mode", "word"),
+        )
+        for rule in rule_configs
+    ]
+
+
+def apply_rules(jobs_df, rules):
+    """
+    Return the jobs that pass every rule.
+    """
+    if jobs_df.empty or not rules:
+        return jobs_df
+
+    keep = pd.Series(True, index=jobs_df.index)
+    for rule in rules:
+        rule_keep = rule.keep_mask(jobs_df)
+        print(f"Rule on '{rule.field}' rejects {int((keep & ~rule_keep).sum())} more jobs.")
+        keep &= rule_keep
+    return jobs_df[keep]
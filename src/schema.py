@@ -0,0 +1,48 @@
+# The columns jobspy.scrape_jobs returns, in its order.
+JOBSPY_COLUMNS = [
+    "id", "site", "job_url", "job_url_direct", "title", "company", "location", "date_posted",
+    "job_type", "salary_source", "interval", "min_amount", "max_amount", "currency", "is_remote",
+    "job_level", "job_function", "listing_type", "emails", "description", "company_industry",
+    "company_url", "company_logo", "company_url_direct", "company_addresses", "company_num_employees",
+    "company_revenue", "company_description", "skills", "experience_range", "company_rating",
+    "company_reviews_count", "vacancy_count", "work_from_home_type",
+]
+
+# Columns the pipeline, the GUI and the seen history rely on; always kept.
+REQUIRED_COLUMNS = ["site", "job_url", "title", "company", "location", "description"]
+
+# What is kept of a scraped job by default: the required columns plus what is useful when triaging.
+DEFAULT_KEPT_COLUMNS = [
+    "id", "site", "job_url", "job_url_direct", "title", "company", "location", "date_posted",
+    "job_type", "interval", "min_amount", "max_amount", "currency", "is_remote", "job_level", "description",
+]
+
+# Low-cardinality text columns, stored as categoricals (codes plus one copy of each distinct value).
+CATEGORICAL_COLUMNS = ["site", "company", "location", "job_type", "interval", "currency", "job_level"]
+
+
+def kept_columns(columns=None):
+    """
+    Return the columns to keep of scraped jobs: the given ones (or the defaults) plus the required ones.
+    """
+    columns = list(columns) if columns else list(DEFAULT_KEPT_COLUMNS)
+    return columns + [c for c in REQUIRED_COLUMNS if c not in columns]
+
+
+def compact_jobs_frame(jobs, columns=None):
+    """
+    Return jobs reduced to the kept columns (those it has, in kept order), with the low-cardinality
+    text columns as categoricals.
+    """
+    if jobs.empty:
+        return jobs
+    columns = [c for c in kept_columns(columns) if c in jobs.columns]
+    jobs = jobs[columns].copy()
+    for column in CATEGORICAL_COLUMNS:
+        if column in jobs.columns and jobs[column].dtype == object:
+            try:
+                jobs[column] = jobs[column].astype("category")
+            except TypeError:
+                # Unhashable values (e.g. lists): leave the column as it is.
+                pass
+    return jobs
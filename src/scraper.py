@@ -1,13 +1,68 @@
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import NamedTuple
 import pandas as pd
 from jobspy import scrape_jobs
+from src.site_scheduler import AdaptiveDelay, SuspectedThrottling, is_throttling
+
+
+class ScrapeTask(NamedTuple):
+    """
+    A single scrape_jobs call: the sites it hits, the keyword arguments it is called with,
+    and a human-readable description used in log messages.
+    """
+    label: str
+    sites: tuple
+    params: dict
+    description: str
+
+
+def _site_name(sites):
+    """
+    Return the site_name argument of scrape_jobs for the given sites.
+    """
+    return list(sites) if len(sites) > 1 else sites[0]
+
+
+def _reached_end(page, page_size, known_urls):
+    """
+    Return True if a site's page of results is the last one worth fetching.
+    """
+    if len(page) < page_size:
+        return True
+    return "job_url" in page.columns and page["job_url"].isin(known_urls).any()
 
 
 class JobScraper:
-    def __init__(self, proxies):
+    def __init__(
+            self,
+            proxies,
+            max_workers=1,
+            site_concurrency=None,
+            proxy_pool=None,
+            watermarks=None,
+            page_size=25,
+            journal=None,
+            metrics=None,
+            site_retries=0,
+            site_delay=None,
+            fetch_descriptions=True
+    ):
         self.proxies = proxies
+        self.fetch_descriptions = fetch_descriptions
+        self.metrics = metrics
+        self.journal = journal
+        self.proxy_pool = proxy_pool
+        self.watermarks = watermarks
+        self.page_size = page_size
         self.new_jobs = pd.DataFrame()
+        self.max_workers = max(1, int(max_workers or 1))
+        self.site_concurrency = {site: max(1, int(limit)) for site, limit in (site_concurrency or {}).items()}
+        self.site_retries = max(0, int(site_retries or 0))
+        self.site_delay = site_delay if site_delay is not None else AdaptiveDelay()
 
-    def scrape_job_board_jobs(
+    def board_tasks(
             self,
             search_term,
             location,
@@ -17,78 +72,259 @@ class JobScraper:
             distance=200,
             country_indeed="USA"
     ):
-        all_jobs = pd.DataFrame()
+        """
+        Return the scrape tasks for one job board search entry: one per site, so that each site
+        is scheduled, throttled and retried on its own. Without fetch_descriptions, LinkedIn listings
+        come without descriptions (see src.descriptions for fetching them later).
+        """
         indeed_search_term = indeed_search_term or search_term
+        common = {
+            "location": location,
+            "results_wanted": results_wanted,
+            "hours_old": hours_old,
+            "distance": distance,
+            "country_indeed": country_indeed,
+        }
 
-        # --- Scrape non-Indeed job boards ---
-        non_indeed_sites = ["linkedin", "zip_recruiter", "glassdoor"]
-        try:
-            jobs = scrape_jobs(
-                site_name=non_indeed_sites,
-                search_term=search_term,
-                location=location,
-                results_wanted=results_wanted,
-                hours_old=hours_old,
-                distance=distance,
-                country_indeed=country_indeed,
-                linkedin_fetch_description=True,
-                proxies=self.proxies
+        site_params = {"linkedin": {"linkedin_fetch_description": True}} if self.fetch_descriptions else {}
+        tasks = [
+            ScrapeTask(
+                label=site.upper(),
+                sites=(site,),
+                params={**common, "search_term": search_term, **site_params.get(site, {})},
+                description=f"'{search_term}' in '{location}'",
             )
-            print(f"[JOB BOARDS] Scraped {len(jobs)} jobs for '{search_term}' in '{location}' (non-Indeed sites).")
-        except Exception as e:
-            print(f"Error scraping job boards for '{search_term}' in '{location}': {e}")
-            jobs = pd.DataFrame()
-
-        all_jobs = pd.concat([all_jobs, jobs], ignore_index=True)
+            for site in ("linkedin", "zip_recruiter", "glassdoor")
+        ]
+        tasks.append(
+            ScrapeTask(
+                label="INDEED",
+                sites=("indeed",),
+                params={**common, "search_term": indeed_search_term},
+                description=f"'{indeed_search_term}' in '{location}'",
+            )
+        )
+        return tasks
 
-        # --- Scrape Indeed separately ---
-        try:
-            indeed_jobs = scrape_jobs(
-                site_name="indeed",
-                search_term=indeed_search_term,
-                location=location,
-                results_wanted=results_wanted,
-                hours_old=hours_old,
-                distance=distance,
-                country_indeed=country_indeed,
-                proxies=self.proxies
+    def google_tasks(self, search_term, results_wanted=20):
+        """
+        Return the scrape tasks for one Google jobs search entry.
+        """
+        return [
+            ScrapeTask(
+                label="GOOGLE",
+                sites=("google",),
+                params={"google_search_term": search_term, "results_wanted": results_wanted},
+                description=f"'{search_term}'",
             )
-            print(f"[INDEED] Scraped {len(indeed_jobs)} jobs for '{indeed_search_term}' in '{location}'.")
-        except Exception as e:
-            print(f"Error scraping Indeed for '{indeed_search_term}' in '{location}': {e}")
-            indeed_jobs = pd.DataFrame()
+        ]
 
-        all_jobs = pd.concat([all_jobs, indeed_jobs], ignore_index=True)
+    def run_tasks(self, tasks):
+        """
+        Run the given scrape tasks and merge their results into new_jobs.
+        """
+        frames = [jobs for jobs in self.iter_tasks(tasks) if not jobs.empty]
+        if frames:
+            self.new_jobs = pd.concat([self.new_jobs, *frames], ignore_index=True)
 
-        # --- Validate and update new_jobs ---
-        if all_jobs.empty:
-            print("No jobs scraped.")
-            return
-        if "job_url" not in all_jobs.columns:
-            print("Error: 'job_url' column is missing from the scraped jobs DataFrame.")
+    def _site_limit(self, site):
+        return self.site_concurrency.get(site, self.max_workers)
+
+    def iter_tasks(self, tasks):
+        """
+        Run the given scrape tasks and yield one DataFrame of jobs per task, in task order.
+        Every site has its own queue: a task starts once a worker is free (at most max_workers run at once),
+        fewer than site_concurrency[site] tasks are hitting each of its sites, and the site's adaptive delay
+        (see src.site_scheduler) since the last call to it has passed. So a slow or throttled site only
+        holds up its own queue. A failed task, or one whose result looks cut short by throttling
+        (see _short_sites), is re-queued on its site, up to site_retries times.
+        Tasks still finish in any order; a finished batch is held until the batches of the tasks before it
+        are yielded, so the run's merge order (and which duplicate wins) does not depend on timing.
+        A task's watermarks are only updated once the consumer asks for the next batch, i.e. after it has
+        processed this one, so an interrupted run never skips postings it did not get to keep.
+        """
+        queues = {}
+        for number, task in enumerate(tasks):
+            queues.setdefault(task.sites, deque()).append((number, task, 0))
+        in_flight = defaultdict(int)
+        running = {}
+        finished = {}
+        next_number = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while running or any(queues.values()):
+                now = time.monotonic()
+                waits = []
+                for sites, queue in queues.items():
+                    key = "+".join(sites)
+                    while queue and len(running) < self.max_workers and all(
+                            in_flight[site] < self._site_limit(site) for site in sites):
+                        wait_time = self.site_delay.wait_time(key, now)
+                        if wait_time > 0:
+                            waits.append(wait_time)
+                            break
+                        number, task, attempt = queue.popleft()
+                        self.site_delay.started(key, now)
+                        for site in sites:
+                            in_flight[site] += 1
+                        running[executor.submit(self._run_task, task)] = (number, task, attempt)
+
+                timeout = min(waits) if waits else None
+                if not running:
+                    time.sleep(timeout)
+                    continue
+
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    number, task, attempt = running.pop(future)
+                    for site in task.sites:
+                        in_flight[site] -= 1
+                    jobs, ok, error = future.result()
+                    key = "+".join(task.sites)
+                    self.site_delay.record(key, ok, error)
+
+                    if error is not None and attempt < self.site_retries:
+                        reason = "throttled" if is_throttling(error) else "failed"
+                        print(f"[{task.label}] Scrape {reason} for {task.description}, retrying in "
+                              f"{self.site_delay.wait_time(key):.1f}s (retry {attempt + 1}/{self.site_retries}).")
+                        if self.metrics is not None:
+                            self.metrics.record_retry(key)
+                        queues[task.sites].append((number, task, attempt + 1))
+                        continue
+                    finished[number] = (task, jobs, ok)
+
+                while next_number in finished:
+                    task, jobs, ok = finished.pop(next_number)
+                    next_number += 1
+                    yield jobs
+                    self._finish_task(task, jobs, ok)
+
+    def _finish_task(self, task, jobs, ok):
+        """
+        Record a successfully scraped task in the watermarks (only for the sites that returned jobs)
+        and the run journal.
+        """
+        if not ok:
             return
+        if self.journal is not None:
+            self.journal.record_done(task)
+        if self.watermarks is not None:
+            search_term = task.params.get("search_term") or task.params.get("google_search_term")
+            self.watermarks.update(task.sites, search_term, task.params.get("location", ""), jobs)
 
-        self.new_jobs = pd.concat([self.new_jobs, all_jobs], ignore_index=True)
+    def _run_task(self, task):
+        """
+        Call scrape_jobs for a single task.
+        With a proxy pool, the call goes through one proxy picked by the pool, and its outcome is reported back.
+        Returns (jobs, ok, error): on error or if the result cannot be used, jobs is an empty DataFrame and
+        ok is False, and error is the exception raised by the scrape, if any. If the result looks cut short
+        by throttling, jobs holds it but ok is False and error is a SuspectedThrottling.
+        Tasks scraped before an interruption are read back from the run journal instead.
+        """
+        if self.journal is not None:
+            jobs = self.journal.load_batch(task)
+            if jobs is not None:
+                print(f"[{task.label}] Recovered {len(jobs)} jobs for {task.description} from the run journal.")
+                return jobs, True, None
 
-    def scrape_google_jobs(self, search_term, results_wanted=20):
+        proxy = None
+        start = time.monotonic()
         try:
-            jobs = scrape_jobs(
-                site_name="google",
-                google_search_term=search_term,
-                results_wanted=results_wanted,
-                proxies=self.proxies
-            )
-            print(f"[GOOGLE] Scraped {len(jobs)} jobs for '{search_term}'.")
+            proxy = self.proxy_pool.acquire(task.sites) if self.proxy_pool else None
+            start = time.monotonic()
+            jobs, calls = self._scrape(task, [proxy] if proxy else self.proxies)
+            print(f"[{task.label}] Scraped {len(jobs)} jobs for {task.description}.")
+            short_sites = self._short_sites(task, jobs)
+            if proxy:
+                self.proxy_pool.report(proxy, success=not short_sites, latency=time.monotonic() - start)
+            if self.metrics is not None:
+                self.metrics.record_site(task.sites, time.monotonic() - start, len(jobs), ok=not short_sites,
+                                         calls=calls)
         except Exception as e:
-            print(f"Error scraping Google jobs for '{search_term}': {e}")
-            return
+            print(f"Error scraping {task.label.lower()} for {task.description}: {e}")
+            if proxy:
+                self.proxy_pool.report(proxy, success=False, latency=time.monotonic() - start)
+            if self.metrics is not None:
+                self.metrics.record_site(task.sites, time.monotonic() - start, 0, ok=False)
+            return pd.DataFrame(), False, e
 
-        if "job_url" not in jobs.columns:
+        if not jobs.empty and "job_url" not in jobs.columns:
             print("Error: 'job_url' column is missing from the scraped jobs DataFrame.")
-            return
+            return pd.DataFrame(), False, None
+        if short_sites:
+            print(f"[{task.label}] {', '.join(short_sites)} came back short for {task.description} "
+                  f"({len(jobs)} jobs, none seen last time): treating it as throttling.")
+            return jobs, False, SuspectedThrottling(f"short result from {', '.join(short_sites)}")
+        if self.journal is not None:
+            self.journal.record_scraped(task, jobs)
+        return jobs, True, None
+
+    def _short_sites(self, task, jobs):
+        """
+        Return the sites of the task whose result looks cut short by throttling, which jobspy does not raise
+        for: sites that had results last time (they have a watermark) but now returned none, or fewer than
+        results_wanted without reaching any job that was at the top of their results last time.
+        """
+        if self.watermarks is None:
+            return []
+        search_term = task.params.get("search_term") or task.params.get("google_search_term")
+        location = task.params.get("location", "")
+        results_wanted = task.params.get("results_wanted", 20)
+        short_sites = []
+        for site in task.sites:
+            known = self.watermarks.known_urls(site, search_term, location)
+            if not known:
+                continue
+            site_jobs = jobs[jobs["site"] == site] if "site" in jobs.columns else jobs
+            if site_jobs.empty:
+                short_sites.append(site)
+            elif len(site_jobs) < results_wanted and "job_url" in site_jobs.columns \
+                    and not site_jobs["job_url"].isin(known).any():
+                short_sites.append(site)
+        return short_sites
+
+    def _scrape(self, task, proxies):
+        """
+        Call scrape_jobs for a task and return (jobs, number of scrape_jobs calls made).
+        With watermarks, hours_old is narrowed to the time since the last scrape of the same query,
+        and results are fetched page by page: a site stops paging as soon as a page comes back short
+        or reaches a posting that was at the top of its results last time.
+        """
+        if self.watermarks is None:
+            return scrape_jobs(site_name=_site_name(task.sites), proxies=proxies, **task.params), 1
+
+        search_term = task.params.get("search_term") or task.params.get("google_search_term")
+        location = task.params.get("location", "")
+        params = dict(task.params)
+        if "hours_old" in params:
+            params["hours_old"] = self.watermarks.hours_old(task.sites, search_term, location, params["hours_old"])
+
+        results_wanted = params.pop("results_wanted", 20)
+        page_size = min(self.page_size, results_wanted)
+        known = {site: self.watermarks.known_urls(site, search_term, location) for site in task.sites}
+        if not any(known.values()):
+            jobs = scrape_jobs(site_name=_site_name(task.sites), proxies=proxies, results_wanted=results_wanted, **params)
+            return jobs, 1
+
+        sites, pages, offset = list(task.sites), [], 0
+        while sites and offset < results_wanted:
+            page = scrape_jobs(
+                site_name=_site_name(sites), proxies=proxies, results_wanted=page_size, offset=offset, **params
+            )
+            pages.append(page)
+            sites = [
+                site for site in sites
+                if not _reached_end(page[page["site"] == site] if "site" in page.columns else page,
+                                    page_size, known[site])
+            ]
+            offset += page_size
+        return pd.concat(pages, ignore_index=True) if pages else pd.DataFrame(), len(pages)
+
+    def scrape_job_board_jobs(self, *args, **kwargs):
+        self.run_tasks(self.board_tasks(*args, **kwargs))
 
-        if not jobs.empty:
-            self.new_jobs = pd.concat([self.new_jobs, jobs], ignore_index=True)
+    def scrape_google_jobs(self, *args, **kwargs):
+        self.run_tasks(self.google_tasks(*args, **kwargs))
 
     def drop_duplicates(self):
         if not self.new_jobs.empty:
@@ -0,0 +1,123 @@
+import bisect
+import re
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+
+SEARCH_FIELDS = ["title", "company", "location", "description"]
+FACET_FIELDS = ["company", "location"]
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+
+def tokenize(text):
+    """
+    Return the lowercased word tokens of text ("c++" and "c#" stay whole).
+    """
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+class JobSearchIndex:
+    """
+    In-memory inverted index over the title, company, location and description of a jobs file:
+    every token maps to the sorted array of the rows that contain it. Queries AND their tokens and
+    treat the last one as a prefix, so results can follow the user's typing. Company and location
+    are also factorized into codes, for facet counts and facet filters over a result set.
+    """
+
+    def __init__(self, columns=None):
+        """
+        Build the index from columns, a dict of field name to a sequence of values (one per row).
+        Without columns, the index starts empty: add() the rows chunk by chunk, then call finish().
+        """
+        self.row_count = 0
+        self._postings = defaultdict(list)
+        self._facets = {field: [] for field in FACET_FIELDS}
+        if columns is not None:
+            self.add(columns)
+            self.finish()
+
+    def add(self, columns):
+        """
+        Index the next rows, given like the columns of the constructor. Only their tokens and facet values
+        are kept, not the text itself.
+        """
+        rows = len(next(iter(columns.values()))) if columns else 0
+        for field in SEARCH_FIELDS:
+            if field not in columns:
+                continue
+            for row, value in enumerate(columns[field], start=self.row_count):
+                if pd.isna(value):
+                    continue
+                for token in set(tokenize(value)):
+                    self._postings[token].append(row)
+        for field in FACET_FIELDS:
+            self._facets[field].append(pd.Series(columns.get(field, [None] * rows), dtype=object))
+        self.row_count += rows
+
+    def finish(self):
+        """
+        Turn the rows added so far into the posting arrays and facet codes that searches use.
+        """
+        self.postings = {token: np.asarray(rows, dtype=np.int32) for token, rows in self._postings.items()}
+        self.terms = sorted(self.postings)
+        self._postings = defaultdict(list)
+
+        self.facet_codes = {}
+        self.facet_values = {}
+        for field in FACET_FIELDS:
+            parts = self._facets[field]
+            values = pd.concat(parts, ignore_index=True) if parts else pd.Series(dtype=object)
+            codes, uniques = pd.factorize(values.str.strip())
+            self.facet_codes[field] = codes
+            self.facet_values[field] = list(uniques)
+        self._facets = {field: [] for field in FACET_FIELDS}
+
+    def _prefix_rows(self, prefix):
+        start = bisect.bisect_left(self.terms, prefix)
+        matches = []
+        for term in self.terms[start:]:
+            if not term.startswith(prefix):
+                break
+            matches.append(self.postings[term])
+        if not matches:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(matches))
+
+    def search(self, query="", facets=None):
+        """
+        Return the sorted rows that match every token of query (the last one as a prefix) and every
+        facet filter in facets, a dict of facet field to value. An empty query matches every row.
+        """
+        rows = None
+        tokens = tokenize(query)
+        for position, token in enumerate(tokens):
+            if position == len(tokens) - 1 and not query[-1:].isspace():
+                matches = self._prefix_rows(token)
+            else:
+                matches = self.postings.get(token, np.empty(0, dtype=np.int32))
+            rows = matches if rows is None else np.intersect1d(rows, matches, assume_unique=True)
+            if len(rows) == 0:
+                return rows
+
+        if rows is None:
+            rows = np.arange(self.row_count, dtype=np.int32)
+
+        for field, value in (facets or {}).items():
+            if value is None:
+                continue
+            try:
+                code = self.facet_values[field].index(value)
+            except ValueError:
+                return np.empty(0, dtype=np.int32)
+            rows = rows[self.facet_codes[field][rows] == code]
+        return rows
+
+    def facet_counts(self, rows, field, top=50):
+        """
+        Return the top (value, count) pairs of a facet field among the given rows, most frequent first.
+        """
+        codes = self.facet_codes[field][rows]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.facet_values[field]))
+        order = np.argsort(-counts, kind="stable")[:top]
+        return [(self.facet_values[field][code], int(counts[code])) for code in order if counts[code] > 0]
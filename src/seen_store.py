@@ -0,0 +1,334 @@
+import os
+import shutil
+import sqlite3
+import numpy as np
+import pandas as pd
+from src.parquet_store import append_parquet_jobs, is_parquet, read_parquet_jobs
+from src.utils import save_jobs
+
+SEEN_COLUMNS = ["title", "company", "location", "job_url"]
+
+# SQLite limits the number of host parameters per statement; stay well below it.
+_SQLITE_CHUNK = 500
+
+
+def job_identity_keys(jobs):
+    """
+    Vectorized get_job_identity: return a Series of 64-bit hashes, one per row of the jobs DataFrame,
+    of the (title, company, location) identity -- all stripped and lowercased.
+    Two rows have the same hash exactly when get_job_identity returns the same tuple for them.
+    """
+    identity = pd.DataFrame(index=jobs.index)
+    for field in ("title", "company", "location"):
+        if field in jobs.columns:
+            identity[field] = jobs[field].astype(str).str.strip().str.lower()
+        else:
+            identity[field] = ""
+    return pd.util.hash_pandas_object(identity, index=False)
+
+
+def identity_hashes(jobs):
+    """
+    Return the identity hashes of jobs as a nullable Series of signed 64-bit integers (what the seen stores
+    keep), with <NA> for jobs that lack a title, company or location. Rows of a seen history that already
+    carry an identity column keep their stored hash.
+    """
+    keys = pd.Series(job_identity_keys(jobs).to_numpy().view(np.int64), index=jobs.index, dtype="Int64")
+    complete = jobs.reindex(columns=["title", "company", "location"]).notna().all(axis=1)
+    keys = keys.where(complete)
+    if "identity" in jobs.columns:
+        # Seen histories store the hash itself rather than the strings.
+        keys = jobs["identity"].astype("Int64").fillna(keys)
+    return keys
+
+
+def _job_urls(jobs):
+    """
+    Return the stripped job_url of every row of jobs as strings ("" if the column is missing).
+    """
+    if "job_url" in jobs.columns:
+        return jobs["job_url"].astype(str).str.strip()
+    return pd.Series("", index=jobs.index)
+
+
+def seen_mask(jobs, seen_jobs):
+    """
+    Given a jobs DataFrame and a seen jobs DataFrame, return a boolean Series aligned to jobs
+    that is True for every job whose job_url or identity is already in seen_jobs.
+    Membership is tested column-wise with hashed anti-joins rather than row by row.
+    """
+    seen_job_urls = seen_jobs["job_url"].dropna()
+    seen_identity = job_identity_keys(seen_jobs.dropna(subset=["title", "company", "location"]))
+    return _job_urls(jobs).isin(seen_job_urls) | job_identity_keys(jobs).isin(seen_identity)
+
+
+class _HashedSeenStore:
+    """
+    Seen history of (job_url, identity) pairs, where identity is the 64-bit hash of the normalized
+    (title, company, location) rather than the strings themselves. It is loaded once, and its job_urls and
+    identities are kept in memory as sets; commit() appends just the jobs added since the last commit
+    (rollback() forgets them instead), so checking and committing a batch costs as much as the batch,
+    not as the whole history. Subclasses load the history and append to it.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._job_urls = set()
+        self._identities = set()
+        self._count = 0
+        self._pending = []
+        self._added_identities = []
+
+    def _load(self, seen):
+        """
+        Fill the sets from a history DataFrame with a job_url column and identity or title, company and
+        location columns.
+        """
+        self._job_urls = set(seen["job_url"].dropna())
+        self._identities = set(identity_hashes(seen).dropna().astype("int64"))
+        self._count = len(seen)
+
+    def __len__(self):
+        return self._count
+
+    def is_seen(self, jobs):
+        """
+        Return a boolean Series aligned to jobs, True for jobs that are already seen.
+        """
+        seen = [
+            job_url in self._job_urls or (not pd.isna(identity) and identity in self._identities)
+            for job_url, identity in zip(_job_urls(jobs), identity_hashes(jobs))
+        ]
+        return pd.Series(seen, index=jobs.index, dtype=bool)
+
+    def add(self, jobs):
+        """
+        Record the given jobs as seen, skipping any job_url already seen. They are persisted on commit().
+        """
+        if jobs.empty:
+            return
+        seen = pd.DataFrame({"job_url": jobs["job_url"] if "job_url" in jobs.columns else None,
+                             "identity": identity_hashes(jobs)})
+        seen = seen[~seen["job_url"].map(lambda job_url: job_url in self._job_urls) | seen["job_url"].isna()]
+        seen = seen[~seen["job_url"].duplicated() | seen["job_url"].isna()].reset_index(drop=True)
+        if seen.empty:
+            return
+        identities = set(seen["identity"].dropna().astype("int64"))
+        self._added_identities.extend(identities - self._identities)
+        self._job_urls.update(seen["job_url"].dropna())
+        self._identities.update(identities)
+        self._count += len(seen)
+        self._pending.append(seen)
+
+    def _append(self, seen):
+        raise NotImplementedError
+
+    def commit(self):
+        if self._pending:
+            self._append(pd.concat(self._pending, ignore_index=True))
+            self._pending = []
+        self._added_identities = []
+
+    def rollback(self):
+        """
+        Forget the jobs added since the last commit.
+        """
+        for seen in self._pending:
+            self._job_urls.difference_update(seen["job_url"].dropna())
+            self._count -= len(seen)
+        self._identities.difference_update(self._added_identities)
+        self._pending = []
+        self._added_identities = []
+
+    def close(self):
+        # Uncommitted jobs belong to batches that were never saved: they are dropped, not committed.
+        self.rollback()
+
+
+class CsvSeenStore(_HashedSeenStore):
+    """
+    Seen history kept in a CSV file of job_url and identity hash columns (see _HashedSeenStore).
+    A file written before identities were hashed, which holds the title, company and location strings,
+    is rewritten once in the hashed format when it is opened.
+    """
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        if not os.path.exists(file_path):
+            print(f"{file_path} not found. Starting with an empty seen history.")
+            return
+        try:
+            seen = pd.read_csv(file_path, usecols=lambda c: c in ["job_url", "identity", *SEEN_COLUMNS],
+                               dtype={"identity": "Int64"})
+        except Exception as e:
+            print(f"Error loading seen jobs: {e}")
+            return
+        self._load(seen)
+        print(f"Loaded {self._count} seen jobs from {file_path}.")
+        if any(column in seen.columns for column in SEEN_COLUMNS[:3]):
+            self._rewrite_hashed(seen)
+
+    def _rewrite_hashed(self, seen):
+        hashed = pd.DataFrame({"job_url": seen["job_url"], "identity": identity_hashes(seen)})
+        # Write next to the file and swap it in, so an interrupted rewrite leaves the old file intact.
+        tmp_path = self.file_path + ".tmp"
+        save_jobs(tmp_path, hashed)
+        os.replace(tmp_path, self.file_path)
+        print(f"Rewrote {self.file_path} with hashed identities instead of titles, companies and locations.")
+
+    def _append(self, seen):
+        save_jobs(self.file_path, seen, append=True)
+
+
+class ParquetSeenStore(_HashedSeenStore):
+    """
+    Seen history kept in a Parquet dataset of job_url and identity hash columns (see _HashedSeenStore).
+    Parts written before identities were hashed, which hold the strings, are hashed when loaded.
+    """
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        if os.path.exists(file_path):
+            self._load(read_parquet_jobs(file_path, columns=["job_url", "identity", *SEEN_COLUMNS[:3]]))
+        print(f"Loaded {self._count} seen jobs from {file_path}.")
+
+    def _append(self, seen):
+        append_parquet_jobs(self.file_path, seen)
+
+
+class SqliteSeenStore:
+    """
+    Seen history kept in an indexed SQLite database.
+    Lookups only touch the rows being checked, and add() inserts only the new rows,
+    so neither memory nor I/O grows with the size of the history.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.conn = sqlite3.connect(file_path)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS seen_jobs (
+                job_url TEXT UNIQUE,
+                identity INTEGER,
+                title TEXT,
+                company TEXT,
+                location TEXT
+            );
+            CREATE INDEX IF NOT EXISTS seen_jobs_identity ON seen_jobs (identity);
+            """
+        )
+        print(f"Opened seen jobs database {file_path} ({len(self)} seen jobs).")
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM seen_jobs").fetchone()[0]
+
+    @staticmethod
+    def _identities(jobs):
+        """
+        Return the identity hashes of jobs as Python ints (SQLite's INTEGER type), with None for jobs
+        that lack a title, company or location.
+        """
+        return [None if pd.isna(key) else int(key) for key in identity_hashes(jobs)]
+
+    def _existing(self, column, values):
+        """
+        Return the subset of values that are present in the given column of seen_jobs.
+        """
+        values = list({v for v in values if v is not None})
+        found = set()
+        for start in range(0, len(values), _SQLITE_CHUNK):
+            chunk = values[start:start + _SQLITE_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT {column} FROM seen_jobs WHERE {column} IN ({placeholders})", chunk
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def is_seen(self, jobs):
+        """
+        Return a boolean Series aligned to jobs, True for jobs that are already seen.
+        """
+        if jobs.empty:
+            return pd.Series(False, index=jobs.index)
+
+        job_urls = _job_urls(jobs)
+        identities = pd.Series(job_identity_keys(jobs).to_numpy().view(np.int64), index=jobs.index)
+        seen_urls = self._existing("job_url", job_urls.tolist())
+        seen_identities = self._existing("identity", identities.tolist())
+        return job_urls.isin(seen_urls) | identities.isin(seen_identities)
+
+    def add(self, jobs):
+        """
+        Record the given jobs as seen, skipping any job_url already in the database.
+        """
+        if jobs.empty:
+            return
+        # Only the URL and the identity hash are stored; the text columns stay for older databases.
+        job_urls = jobs["job_url"].astype(object) if "job_url" in jobs.columns else pd.Series(None, index=jobs.index)
+        rows = zip(job_urls.where(job_urls.notna(), None), self._identities(jobs))
+        self.conn.executemany("INSERT OR IGNORE INTO seen_jobs (job_url, identity) VALUES (?, ?)", rows)
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        """
+        Discard the jobs added since the last commit.
+        """
+        self.conn.rollback()
+
+    def close(self):
+        # Uncommitted jobs belong to batches that were never saved: they are dropped, not committed.
+        self.rollback()
+        self.conn.close()
+
+
+def _remove_store(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def migrate_seen_csv(csv_path, store_path, store_class=None):
+    """
+    One-shot migration of a seen.csv history into a SQLite (default) or Parquet seen store.
+    Returns the number of seen jobs in the store afterwards.
+    """
+    store_class = store_class or SqliteSeenStore
+    # Build into a temporary path so that a failed migration is retried on the next run.
+    tmp_path = store_path.rstrip(os.sep) + ".tmp"
+    _remove_store(tmp_path)
+
+    store = store_class(tmp_path)
+    try:
+        for chunk in pd.read_csv(csv_path, usecols=lambda c: c in ["identity", *SEEN_COLUMNS],
+                                 dtype={"identity": "Int64"}, chunksize=100_000):
+            store.add(chunk)
+        store.commit()
+        count = len(store)
+    finally:
+        store.close()
+    _remove_store(store_path)
+    os.replace(tmp_path, store_path)
+    print(f"Migrated {csv_path} into {store_path} ({count} seen jobs).")
+    return count
+
+
+def open_seen_store(file_path, legacy_csv_path=None):
+    """
+    Open the seen store for file_path: SQLite for .db/.sqlite files, Parquet for .parquet ones, CSV otherwise.
+    If a SQLite or Parquet store does not exist yet but legacy_csv_path does, the CSV history is migrated first.
+    """
+    migrate = not os.path.exists(file_path) and legacy_csv_path and os.path.exists(legacy_csv_path)
+    if os.path.splitext(file_path)[1].lower() in (".db", ".sqlite", ".sqlite3"):
+        if migrate:
+            migrate_seen_csv(legacy_csv_path, file_path)
+        return SqliteSeenStore(file_path)
+    if is_parquet(file_path):
+        if migrate:
+            migrate_seen_csv(legacy_csv_path, file_path, ParquetSeenStore)
+        return ParquetSeenStore(file_path)
+    return CsvSeenStore(file_path)
@@ -0,0 +1,77 @@
+import threading
+import time
+
+_THROTTLING_MARKERS = ("429", "too many requests", "rate limit", "timed out", "timeout")
+
+
+class SuspectedThrottling(Exception):
+    """
+    A scrape that did not fail but came back cut short, the way jobspy reports a 429 or a block:
+    it logs it and returns an empty or partial result instead of raising.
+    """
+
+
+def is_throttling(error):
+    """
+    Return True if a scrape error looks like the site pushing back (rate limiting or timeouts)
+    rather than a plain failure.
+    """
+    if isinstance(error, SuspectedThrottling):
+        return True
+    return error is not None and any(marker in str(error).lower() for marker in _THROTTLING_MARKERS)
+
+
+class AdaptiveDelay:
+    """
+    Per-site delay between the starts of two scrape calls, adjusted to what the site tolerates:
+    it grows multiplicatively (to at least throttled_delay) whenever a call is throttled, times out or comes
+    back cut short (see SuspectedThrottling), and shrinks multiplicatively after every successful call,
+    down to min_delay.
+    Thread-safe.
+    """
+
+    def __init__(self, min_delay=0.0, max_delay=120.0, throttled_delay=5.0, increase=2.0, decrease=0.75):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.throttled_delay = throttled_delay
+        self.increase = increase
+        self.decrease = decrease
+        self.delays = {}
+        self._next_start = {}
+        self._lock = threading.Lock()
+
+    def delay(self, site):
+        with self._lock:
+            return self.delays.get(site, self.min_delay)
+
+    def wait_time(self, site, now=None):
+        """
+        Return the seconds to wait before the next call to site may start.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return max(0.0, self._next_start.get(site, 0.0) - now)
+
+    def started(self, site, now=None):
+        """
+        Record that a call to site starts now.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._next_start[site] = now + self.delays.get(site, self.min_delay)
+
+    def record(self, site, ok, error=None):
+        """
+        Adjust the site's delay to the outcome of a call.
+        """
+        with self._lock:
+            delay = self.delays.get(site, self.min_delay)
+            if is_throttling(error):
+                delay = min(self.max_delay, max(delay * self.increase, self.throttled_delay))
+                # Back off from now, not from when the throttled call started.
+                self._next_start[site] = max(self._next_start.get(site, 0.0), time.monotonic() + delay)
+            elif ok:
+                delay = delay * self.decrease
+                if delay < max(self.min_delay, 0.01):
+                    delay = self.min_delay
+            self.delays[site] = delay
@@ -0,0 +1,90 @@
+import csv
+import os
+import sqlite3
+from collections import Counter
+from src.parquet_store import is_parquet, part_paths, require_pyarrow
+from src.triage import load_reviewed, load_tombstones
+
+# Only the standard library (and pyarrow, for Parquet files) is used here, so that `cli.py stats`
+# answers without importing pandas.
+
+
+def _read_csv_columns(file_path, names):
+    """
+    Return a dict of column name to the list of its values, for the given columns of a CSV file
+    in the project's dialect. Columns the file does not have are left out.
+    """
+    csv.field_size_limit(2 ** 31 - 1)
+    with open(file_path, "r", newline="") as f:
+        reader = csv.reader(f, escapechar="\\")
+        header = next(reader, [])
+        positions = {name: header.index(name) for name in names if name in header}
+        columns = {name: [] for name in positions}
+        for row in reader:
+            for name, position in positions.items():
+                columns[name].append(row[position] if position < len(row) else None)
+    return columns
+
+
+def _read_parquet_columns(file_path, names):
+    """
+    Return a dict of column name to the list of its values, for the given columns of a Parquet dataset.
+    Parts that lack a column contribute nulls.
+    """
+    pa = require_pyarrow()
+    columns = {name: [] for name in names}
+    for part in part_paths(file_path):
+        available = set(pa.parquet.read_schema(part).names)
+        table = pa.parquet.read_table(part, columns=[name for name in names if name in available])
+        for name in names:
+            columns[name].extend(table.column(name).to_pylist() if name in available else [None] * table.num_rows)
+    return columns
+
+
+def count_seen(seen_file):
+    """
+    Return the number of jobs in a seen history (SQLite, Parquet or CSV), or 0 if it does not exist.
+    """
+    if not os.path.exists(seen_file):
+        return 0
+    if os.path.splitext(seen_file)[1].lower() in (".db", ".sqlite", ".sqlite3"):
+        conn = sqlite3.connect(seen_file)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM seen_jobs").fetchone()[0]
+        finally:
+            conn.close()
+    if is_parquet(seen_file):
+        pa = require_pyarrow()
+        return sum(pa.parquet.read_metadata(part).num_rows for part in part_paths(seen_file))
+    return len(_read_csv_columns(seen_file, ["job_url"]).get("job_url", []))
+
+
+def job_stats(jobs_file, seen_file):
+    """
+    Return the counts of a jobs file: jobs (deletions applied), reviewed and unreviewed jobs,
+    jobs per site, and the size of the seen history.
+    """
+    stats = {"jobs": 0, "reviewed": 0, "unreviewed": 0, "sites": Counter(), "seen": count_seen(seen_file)}
+    if not os.path.exists(jobs_file):
+        return stats
+
+    read = _read_parquet_columns if is_parquet(jobs_file) else _read_csv_columns
+    columns = read(jobs_file, ["job_url", "site"])
+    job_urls = columns.get("job_url", [])
+    sites = columns.get("site", [None] * len(job_urls))
+    deleted = load_tombstones(jobs_file)
+    reviewed = load_reviewed(jobs_file)
+    for job_url, site in zip(job_urls, sites):
+        if job_url in deleted:
+            continue
+        stats["jobs"] += 1
+        stats["reviewed" if job_url in reviewed else "unreviewed"] += 1
+        stats["sites"][site or "unknown"] += 1
+    return stats
+
+
+def print_stats(jobs_file, seen_file, stats):
+    print(f"{jobs_file}: {stats['jobs']} jobs ({stats['unreviewed']} unreviewed, {stats['reviewed']} reviewed)")
+    for site, count in stats["sites"].most_common():
+        print(f"  {site:<16} {count}")
+    print(f"{seen_file}: {stats['seen']} seen jobs")
@@ -0,0 +1,133 @@
+import os
+import json
+
+# Triage actions on a jobs file (deletions, reviewed marks and pending LLM decisions) are recorded in JSON lines side files,
+# one job_url per line, so that they never require rewriting the jobs file itself.
+
+
+def tombstone_path(file_path):
+    """
+    Return the path of the tombstone file that records deletions from the given jobs file.
+    """
+    return file_path + ".deleted"
+
+
+def _append_job_urls(path, job_urls):
+    with open(path, "a") as f:
+        f.writelines(json.dumps(job_url) + "\n" for job_url in job_urls)
+
+
+def _load_job_urls(path):
+    if not os.path.exists(path):
+        return set()
+
+    job_urls = set()
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                job_urls.add(json.loads(line))
+    return job_urls
+
+
+def add_tombstone(file_path, job_url):
+    """
+    Record the job with the given job_url as deleted from the jobs file, without rewriting it.
+    The deletion is applied by load_jobs and made permanent by compact_jobs.
+    """
+    add_tombstones(file_path, [job_url])
+
+
+def add_tombstones(file_path, job_urls):
+    """
+    Record the jobs with the given job_urls as deleted from the jobs file, in one append.
+    """
+    _append_job_urls(tombstone_path(file_path), job_urls)
+
+
+def load_tombstones(file_path):
+    """
+    Return the set of job_urls recorded as deleted from the given jobs file.
+    """
+    return _load_job_urls(tombstone_path(file_path))
+
+
+def tombstones_size(file_path):
+    """
+    Return the size in bytes of the tombstones recorded so far for the given jobs file, for clear_tombstones.
+    """
+    path = tombstone_path(file_path)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def clear_tombstones(file_path, size):
+    """
+    Clear the tombstones of the given jobs file that a rewrite applied, its first size bytes (see tombstones_size),
+    keeping those appended since. The file is moved aside first, so that concurrent appends go to a new one.
+    """
+    path = tombstone_path(file_path)
+    if not os.path.exists(path):
+        return
+    applied_path = path + ".applied"
+    os.replace(path, applied_path)
+    with open(applied_path, "rb") as f:
+        data = f.read()
+    # Only whole lines count as applied.
+    later = data[data.rfind(b"\n", 0, size) + 1:]
+    if later:
+        with open(path, "ab") as f:
+            f.write(later)
+    os.remove(applied_path)
+
+
+def reviewed_path(file_path):
+    """
+    Return the path of the file that records which jobs of the given jobs file were reviewed in the GUI.
+    """
+    return file_path + ".reviewed"
+
+
+def add_reviewed(file_path, job_urls):
+    """
+    Record the jobs with the given job_urls as reviewed, in one append.
+    """
+    _append_job_urls(reviewed_path(file_path), job_urls)
+
+
+def load_reviewed(file_path):
+    """
+    Return the set of job_urls recorded as reviewed in the given jobs file.
+    """
+    return _load_job_urls(reviewed_path(file_path))
+
+
+def llm_pending_path(file_path):
+    """
+    Return the path of the file that records which jobs of the given jobs file still wait for an LLM decision.
+    """
+    return file_path + ".llm_pending"
+
+
+def add_llm_pending(file_path, job_urls):
+    """
+    Record the jobs with the given job_urls as waiting for an LLM decision, in one append.
+    """
+    _append_job_urls(llm_pending_path(file_path), job_urls)
+
+
+def load_llm_pending(file_path):
+    """
+    Return the set of job_urls of the given jobs file that still wait for an LLM decision.
+    """
+    return _load_job_urls(llm_pending_path(file_path))
+
+
+def save_llm_pending(file_path, job_urls):
+    """
+    Replace the jobs waiting for an LLM decision with the given job_urls (a handful, unlike the jobs file).
+    """
+    path = llm_pending_path(file_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.writelines(json.dumps(job_url) + "\n" for job_url in sorted(job_urls))
+    os.replace(tmp_path, path)
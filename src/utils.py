@@ -1,49 +1,49 @@
 import os
 import csv
-import json
+import shutil
 import pandas as pd
+from src.parquet_store import (
+    append_parquet_jobs,
+    is_parquet,
+    migrate_csv_to_parquet,
+    read_parquet_jobs,
+    rewrite_parquet_jobs,
+)
+from src.config import jobs_file_name
+from src.triage import clear_tombstones, llm_pending_path, load_tombstones, reviewed_path, tombstones_size
 
 
-def load_config(file_path):
+def jobs_file_path(storage_format, csv_path="new_jobs.csv"):
     """
-    Load the configuration from a JSON file.
+    Return the new jobs file for the given storage format. When switching to Parquet, an existing CSV file
+    (with its pending deletions applied, and its reviewed marks and pending LLM decisions) is migrated on first use.
     """
-    if not os.path.exists(file_path):
-        raise Exception(f"{file_path} not found. You are probably calling main.py from outside of the project folder.")
-
-    with open(file_path, "r") as f:
-        config = json.load(f)
-
-    config["search_job_boards"] = config.get("search_job_boards", False)
-    config["search_google_jobs"] = config.get("search_google_jobs", False)
-
-    config["board_search_terms"] = config.get("board_search_terms", [])
-    config["google_search_terms"] = config.get("google_search_terms", [])
-
-    # Filter options.
-    config["filter_locations"] = config.get("filter_locations", False)
-    config["locations_to_filter"] = config.get("locations_to_filter", [])
-    config["filter_job_titles"] = config.get("filter_job_titles", False)
-    config["job_titles_to_filter"] = config.get("job_titles_to_filter", [])
-    config["filter_companies"] = config.get("filter_companies", False)
-    config["companies_to_filter"] = config.get("companies_to_filter", [])
-    config["filter_with_llm"] = config.get("filter_with_llm", False)
-    config["llm_api_key"] = config.get("llm_api_key", "")
-    config["llm_prompt"] = config.get("llm_prompt", "")
+    if storage_format != "parquet":
+        return csv_path
 
-    return config
+    parquet_path = jobs_file_name(storage_format, csv_path)
+    if not os.path.exists(parquet_path) and os.path.exists(csv_path):
+        compact_jobs(csv_path)
+        migrate_csv_to_parquet(csv_path, parquet_path)
+        for side_path in (reviewed_path, llm_pending_path):
+            if os.path.exists(side_path(csv_path)):
+                shutil.copyfile(side_path(csv_path), side_path(parquet_path))
+    return parquet_path
 
 
 def load_seen_jobs(file_path):
     """
-    Load seen jobs from a CSV file. Expected columns: title, company, location, job_url.
-    If the file doesn't exist, return an empty DataFrame with those columns.
+    Load seen jobs from a CSV file or Parquet dataset. Expected columns: title, company, location, job_url.
+    From Parquet only those columns are read. If the file doesn't exist, return an empty DataFrame with them.
     """
     columns = ["title", "company", "location", "job_url"]
 
     if os.path.exists(file_path):
         try:
-            seen_jobs = pd.read_csv(file_path)
+            if is_parquet(file_path):
+                seen_jobs = read_parquet_jobs(file_path, columns=columns)
+            else:
+                seen_jobs = pd.read_csv(file_path, usecols=lambda c: c in columns)
             print(f"Loaded {len(seen_jobs)} seen jobs from {file_path}.")
             return seen_jobs
         except Exception as e:
@@ -54,22 +54,126 @@ def load_seen_jobs(file_path):
     return pd.DataFrame(columns=columns)
 
 
+def _write_jobs_csv(file_path, jobs, append=False):
+    """
+    Write (or append, without a header) jobs to a CSV file in the project's CSV dialect.
+    """
+    jobs.to_csv(
+        file_path,
+        mode="a" if append else "w",
+        header=not append,
+        quoting=csv.QUOTE_NONNUMERIC,
+        escapechar="\\",
+        index=False
+    )
+
+
 def save_jobs(file_path, jobs, append=False):
     """
-    Save the jobs to a CSV file.
-    If append is True and the file exists, load the existing jobs,
-    append the new jobs, and then save the combined DataFrame.
+    Save the jobs to a CSV file or, for a .parquet path, a Parquet dataset.
+    If append is True and the file exists, only the new jobs are appended to it. For CSV they are
+    reordered to the file's columns; if they carry columns the file does not have yet,
+    the file is rewritten once with the union of the columns.
     """
     if jobs.empty:
         print("No jobs to save.")
         return
 
-    if append and os.path.exists(file_path):
+    if is_parquet(file_path):
+        if append:
+            append_parquet_jobs(file_path, jobs)
+            print(f"Appended {len(jobs)} jobs to {file_path}.")
+        else:
+            rewrite_parquet_jobs(file_path, jobs)
+            print(f"Saved {len(jobs)} jobs to {file_path}.")
+        return
+
+    if append and os.path.exists(file_path) and os.path.getsize(file_path) > 0:
         try:
-            existing_jobs = pd.read_csv(file_path)
-            jobs = pd.concat([existing_jobs, jobs], ignore_index=True)
+            existing_columns = list(pd.read_csv(file_path, nrows=0).columns)
         except Exception as e:
-            print(f"Error loading existing jobs from {file_path}: {e}")
+            print(f"Error reading the header of {file_path}: {e}")
+            existing_columns = None
+
+        if existing_columns is not None:
+            new_columns = [c for c in jobs.columns if c not in existing_columns]
+            if not new_columns:
+                _write_jobs_csv(file_path, jobs.reindex(columns=existing_columns), append=True)
+                print(f"Appended {len(jobs)} jobs to {file_path}.")
+                return
+
+            print(f"New columns {new_columns} for {file_path}, rewriting it.")
+            jobs = pd.concat([pd.read_csv(file_path), jobs], ignore_index=True)
 
-    jobs.to_csv(file_path, quoting=csv.QUOTE_NONNUMERIC, escapechar="\\", index=False)
+    _write_jobs_csv(file_path, jobs)
     print(f"Saved {len(jobs)} jobs to {file_path}.")
+
+
+def load_jobs(file_path, columns=None):
+    """
+    Load jobs from a CSV file or Parquet dataset into a DataFrame, leaving out jobs with a tombstone.
+    With columns, only those columns are returned (and, for Parquet, read).
+    """
+    if not os.path.exists(file_path):
+        print(f"{file_path} not found.")
+        return pd.DataFrame()
+
+    try:
+        if is_parquet(file_path):
+            read_columns = None if columns is None else list(dict.fromkeys([*columns, "job_url"]))
+            jobs = read_parquet_jobs(file_path, columns=read_columns)
+        else:
+            jobs = pd.read_csv(file_path)
+    except Exception as e:
+        print(f"Error loading jobs: {e}")
+        return pd.DataFrame()
+
+    tombstones = load_tombstones(file_path)
+    if tombstones and "job_url" in jobs.columns:
+        jobs = jobs[~jobs["job_url"].isin(tombstones)].reset_index(drop=True)
+    if columns is not None:
+        jobs = jobs.reindex(columns=columns)
+    return jobs
+
+
+def _rewrite_jobs(file_path, jobs, applied_tombstones):
+    """
+    Atomically replace the jobs file (CSV or Parquet) with jobs and clear the tombstones it applied,
+    the first applied_tombstones bytes (see src.triage.tombstones_size).
+    """
+    if is_parquet(file_path):
+        rewrite_parquet_jobs(file_path, jobs)
+    else:
+        tmp_path = file_path + ".tmp"
+        _write_jobs_csv(tmp_path, jobs)
+        os.replace(tmp_path, file_path)
+    clear_tombstones(file_path, applied_tombstones)
+
+
+def compact_jobs(file_path, column="score"):
+    """
+    Apply the pending tombstones of a jobs file in one batch: rewrite the file without
+    the deleted jobs and clear the tombstones. Does nothing if there are no tombstones.
+    While at it, the jobs are sorted by column, highest first (jobs without a value last, the rest in
+    file order), if the file has it, so that the viewer's order (see src.job_source) reads the file in order.
+    """
+    if not load_tombstones(file_path):
+        return
+
+    # Tombstones recorded while the file is rewritten are kept for the next compaction.
+    applied_tombstones = tombstones_size(file_path)
+    jobs = load_jobs(file_path)
+    if column in jobs.columns:
+        values = pd.to_numeric(jobs[column], errors="coerce")
+        jobs = jobs.loc[values.sort_values(ascending=False, kind="stable", na_position="last").index]
+    _rewrite_jobs(file_path, jobs.reset_index(drop=True), applied_tombstones)
+    print(f"Compacted {file_path} ({len(jobs)} jobs remain).")
+
+
+def export_jobs_csv(file_path, csv_path):
+    """
+    Export the jobs of a jobs file (CSV or Parquet, deletions applied) to a CSV file in the project's dialect.
+    """
+    jobs = load_jobs(file_path)
+    _write_jobs_csv(csv_path, jobs)
+    print(f"Exported {len(jobs)} jobs from {file_path} to {csv_path}.")
@@ -0,0 +1,101 @@
+import json
+import math
+import os
+import threading
+import time
+import pandas as pd
+
+
+class WatermarkStore:
+    """
+    Remembers, per (site, search term, location), when the query was last scraped successfully,
+    the newest posting date it returned, and the job URLs at the top of its results.
+    The scraper uses these to narrow hours_old to the time since the last run and to stop paging
+    once it reaches postings it already has.
+    """
+
+    def __init__(self, file_path, overlap_hours=24, top_urls=20):
+        self.file_path = file_path
+        self.overlap_hours = overlap_hours
+        self.top_urls = top_urls
+        self._lock = threading.Lock()
+        self.watermarks = {}
+
+        if file_path and os.path.exists(file_path):
+            try:
+                with open(file_path, "r") as f:
+                    self.watermarks = json.load(f)
+                print(f"Loaded {len(self.watermarks)} scrape watermarks from {file_path}.")
+            except Exception as e:
+                print(f"Error loading watermarks from {file_path}: {e}")
+
+    @staticmethod
+    def _key(site, search_term, location):
+        return json.dumps([site, (search_term or "").strip().lower(), (location or "").strip().lower()])
+
+    def get(self, site, search_term, location):
+        with self._lock:
+            return self.watermarks.get(self._key(site, search_term, location))
+
+    def hours_old(self, sites, search_term, location, hours_old):
+        """
+        Return hours_old narrowed to the time since the least recent scrape of any of the sites
+        (plus overlap_hours, as postings are often dated to the day), or hours_old unchanged
+        if one of the sites has no watermark yet.
+        """
+        scraped = []
+        for site in sites:
+            watermark = self.get(site, search_term, location)
+            if watermark is None:
+                return hours_old
+            scraped.append(watermark["last_scraped"])
+
+        since = (time.time() - min(scraped)) / 3600 + self.overlap_hours
+        narrowed = max(1, math.ceil(since))
+        return narrowed if hours_old is None else min(hours_old, narrowed)
+
+    def known_urls(self, site, search_term, location):
+        """
+        Return the job URLs that were at the top of the site's results last time.
+        """
+        watermark = self.get(site, search_term, location)
+        return set(watermark["top_urls"]) if watermark else set()
+
+    def update(self, sites, search_term, location, jobs):
+        """
+        Record a successful scrape of the given sites, with jobs in the order they were returned.
+        A site that returned no jobs keeps its previous watermark: jobspy returns an empty result when it
+        is throttled or blocked, and advancing last_scraped then would skip postings that were never scraped.
+        """
+        now = time.time()
+        with self._lock:
+            for site in sites:
+                site_jobs = jobs[jobs["site"] == site] if "site" in jobs.columns else jobs
+                if site_jobs.empty:
+                    continue
+                key = self._key(site, search_term, location)
+                previous = self.watermarks.get(key, {})
+
+                newest = previous.get("newest_posting")
+                if "date_posted" in site_jobs.columns:
+                    dates = pd.to_datetime(site_jobs["date_posted"], errors="coerce").dropna()
+                    if not dates.empty:
+                        latest = dates.max().isoformat()
+                        newest = latest if newest is None else max(newest, latest)
+
+                top_urls = site_jobs["job_url"].dropna().head(self.top_urls).tolist()
+                self.watermarks[key] = {
+                    "last_scraped": now,
+                    "newest_posting": newest,
+                    "top_urls": top_urls or previous.get("top_urls", []),
+                }
+
+    def save(self):
+        if not self.file_path:
+            return
+        with self._lock:
+            data = json.dumps(self.watermarks, indent=2)
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, self.file_path)